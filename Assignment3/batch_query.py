@@ -0,0 +1,133 @@
+## Batch probabilistic reasoning over many evidence scenarios
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bn import BayesianNetwork
+from compiled_bn import compile_bn, joint_distributions, load_compiled
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    # A path is memory-mapped by every worker, so they all share one copy of the tables
+    _worker_model = load_compiled(model) if isinstance(model, str) else model
+
+
+def _answer(cbn, group):
+    """(pairs, posteriors, error); a failed group gets NaN rows and its error message."""
+    pairs, evidence = group
+    var_names = list(dict.fromkeys(name for _, name in pairs))
+    try:
+        joints = joint_distributions(cbn, var_names, evidence)
+    except Exception as e:
+        # One bad query must not abort the rest of the batch (or the process pool)
+        return pairs, _nan_rows(cbn, var_names), f"{type(e).__name__}: {e}"
+
+    dists = {}
+    for name, dist in joints.items():
+        norm = sum(dist.values())
+        if norm == 0:
+            return pairs, _nan_rows(cbn, var_names), "impossible evidence: P(evidence) = 0"
+        dists[name] = {val: v / norm for val, v in dist.items()}
+    return pairs, dists, None
+
+
+def _nan_rows(cbn, var_names):
+    # an unknown variable still gets one row, so the failed request stays visible
+    return {
+        name: {val: np.nan for val in (cbn.domains[cbn.index[name]] if name in cbn.index else [None])}
+        for name in var_names
+    }
+
+
+def _run_groups(groups):
+    return [_answer(_worker_model, group) for group in groups]
+
+
+def _as_model(model):
+    if isinstance(model, BayesianNetwork):
+        return compile_bn(model)
+    if isinstance(model, str):
+        return load_compiled(model)
+    return model
+
+
+def _group_by_evidence(requests):
+    """[([(request index, query variable), ...], evidence)], one entry per distinct evidence set."""
+    groups = {}
+    for r, (var_names, evidence) in enumerate(requests):
+        if isinstance(var_names, str):
+            var_names = [var_names]
+        key = tuple(sorted(evidence.items()))
+        pairs, _ = groups.setdefault(key, ([], dict(evidence)))
+        pairs.extend((r, name) for name in var_names)
+    return list(groups.values())
+
+
+def batch_query(model, requests, processes=None):
+    """
+    Posteriors for a list of (query_variables, evidence) pairs.
+
+    model: a CompiledBN, a BayesianNetwork (compiled once here) or the path of a
+    saved compiled model. query_variables is a variable name or a list of names.
+    Requests sharing the same evidence are answered together; with processes > 1
+    the evidence groups are spread over a process pool.
+
+    Returns long-format columns, one row per (request, variable, value):
+    {"request": int array, "variable": array, "value": array, "prob": float array,
+     "error": array}
+    which can be passed directly to pandas.DataFrame. A request that could not
+    be answered (impossible evidence, or any error while evaluating it) gets
+    NaN probabilities and the reason in "error"; "error" is None otherwise.
+    """
+    groups = _group_by_evidence(requests)
+
+    if processes and processes > 1 and len(groups) > 1:
+        # Workers load the model themselves; a path avoids pickling the tables.
+        init_arg = model if isinstance(model, str) else _as_model(model)
+        chunks = [groups[i::processes] for i in range(processes)]
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(init_arg,)) as pool:
+            answered = [item for part in pool.map(_run_groups, chunks) for item in part]
+    else:
+        cbn = _as_model(model)
+        answered = [_answer(cbn, group) for group in groups]
+
+    rows = []
+    for pairs, dists, error in answered:
+        for r, var_name in pairs:
+            for val, prob in dists[var_name].items():
+                rows.append((r, var_name, val, prob, error))
+    rows.sort(key=lambda row: row[0])
+
+    return {
+        "request": np.array([row[0] for row in rows], dtype=np.int64),
+        "variable": np.array([row[1] for row in rows], dtype=object),
+        "value": np.array([row[2] for row in rows], dtype=object),
+        "prob": np.array([row[3] for row in rows], dtype=np.float64),
+        "error": np.array([row[4] for row in rows], dtype=object),
+    }
+
+
+def posterior_array(result, variable, value):
+    """P(variable = value) for every request in a batch_query result (NaN if not queried)."""
+    n = int(result["request"].max()) + 1 if len(result["request"]) else 0
+    out = np.full(n, np.nan)
+    mask = (result["variable"] == variable) & np.array([v == value for v in result["value"]], dtype=bool)
+    out[result["request"][mask]] = result["prob"][mask]
+    return out
+
+
+def single_edge_flood_scenarios(model, query_vars=None):
+    """Requests for every single-edge flood observation (F_i = True / False)."""
+    cbn = _as_model(model)
+    if query_vars is None:
+        query_vars = list(cbn.names)
+    flood_vars = [name for name in cbn.names if name.startswith("F")]
+    return [
+        (query_vars, {f: flooded})
+        for f in flood_vars
+        for flooded in (True, False)
+    ]
+
@@ -11,6 +11,34 @@ class Variable:
         return self.cpt[key][value]
 
 
+class NoisyOrVariable(Variable):
+    """
+    Boolean variable whose CPT is a noisy-OR over boolean parents.
+
+    Only one inhibitor probability per parent is stored:
+    inhibitors[i] = P(X=False | only parent i is True).
+    P(X=False | parents) is the product of the inhibitors of the True
+    parents (times the leak inhibitor), so evaluating the CPT is linear
+    in the number of parents instead of a 2^k table lookup.
+    """
+
+    def __init__(self, name, parents, inhibitors, leak=0.0):
+        super().__init__(name, [True, False], parents, None)
+        self.inhibitors = inhibitors
+        self.leak = leak
+
+    def prob_false(self, assignment):
+        prob_not = 1.0 - self.leak
+        for p, q in zip(self.parents, self.inhibitors):
+            if assignment[p]:
+                prob_not *= q
+        return prob_not
+
+    def prob(self, value, assignment):
+        prob_not = self.prob_false(assignment)
+        return 1.0 - prob_not if value else prob_not
+
+
 class BayesianNetwork:
     def __init__(self):
         self.variables = {}
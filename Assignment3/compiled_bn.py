@@ -0,0 +1,370 @@
+## Compiled Bayesian network: flat arrays + variable elimination
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from bn import NoisyOrVariable
+
+TABULAR, NOISY_OR = 0, 1
+
+ARRAY_FILES = ("kinds", "cards", "parent_ptr", "parent_index", "offsets", "tables", "elim_order")
+
+
+class CompiledBN:
+    """
+    Flat, integer-encoded form of a BayesianNetwork.
+
+    Variables are numbered in topological order (bn.order) and every value is
+    replaced by its index in the variable's domain. All CPTs live in the single
+    float array `tables`, variable i occupying tables[offsets[i]:offsets[i + 1]]:
+      - TABULAR:  CPT of shape cards[parents] + [cards[i]], C order
+      - NOISY_OR: one inhibitor per parent followed by the leak inhibitor
+    Parents are stored CSR-style in parent_ptr / parent_index.
+    """
+
+    def __init__(self, names, domains, kinds, cards, parent_ptr, parent_index,
+                 offsets, tables, elim_order, source_hash=None):
+        self.names = names
+        self.domains = domains
+        self.kinds = kinds
+        self.cards = cards
+        self.parent_ptr = parent_ptr
+        self.parent_index = parent_index
+        self.offsets = offsets
+        self.tables = tables
+        self.elim_order = elim_order
+        self.source_hash = source_hash
+
+        self.index = {name: i for i, name in enumerate(names)}
+        self.value_index = [{val: j for j, val in enumerate(dom)} for dom in domains]
+        # position of every variable in the precomputed elimination order
+        self.elim_rank = np.empty(len(names), dtype=np.int64)
+        self.elim_rank[np.asarray(elim_order)] = np.arange(len(names))
+        self.has_children = np.zeros(len(names), dtype=bool)
+        self.has_children[np.asarray(parent_index, dtype=np.int64)] = True
+
+    def parents(self, i):
+        return self.parent_index[self.parent_ptr[i]:self.parent_ptr[i + 1]]
+
+    def cpt(self, i):
+        block = self.tables[self.offsets[i]:self.offsets[i + 1]]
+        if self.kinds[i] == NOISY_OR:
+            return block
+        shape = [int(self.cards[p]) for p in self.parents(i)] + [int(self.cards[i])]
+        return block.reshape(shape)
+
+    def encode(self, evidence):
+        return {
+            self.index[name]: self.value_index[self.index[name]][val]
+            for name, val in evidence.items()
+        }
+
+
+# -----------------------------------
+# Compilation
+# -----------------------------------
+def _min_degree_order(n, kinds, parent_lists):
+    # Moral graph over the tabular families only: noisy-OR findings are
+    # decomposed into unary factors at query time and never join their parents.
+    nbrs = [set() for _ in range(n)]
+    for i in range(n):
+        if kinds[i] == NOISY_OR:
+            continue
+        family = list(parent_lists[i]) + [i]
+        for a in family:
+            for b in family:
+                if a != b:
+                    nbrs[a].add(b)
+
+    order = []
+    remaining = set(range(n))
+    while remaining:
+        v = min(remaining, key=lambda x: (len(nbrs[x]), x))
+        for a in nbrs[v]:
+            nbrs[a].discard(v)
+            nbrs[a].update(nbrs[v] - {a})
+        remaining.remove(v)
+        order.append(v)
+    return order
+
+
+def compile_bn(bn, source_hash=None):
+    names = list(bn.order)
+    index = {name: i for i, name in enumerate(names)}
+    domains = [list(bn.get(name).domain) for name in names]
+    cards = np.array([len(d) for d in domains], dtype=np.int64)
+
+    kinds = []
+    parent_lists = []
+    blocks = []
+    for name in names:
+        var = bn.get(name)
+        parents = [index[p] for p in var.parents]
+        parent_lists.append(parents)
+
+        if isinstance(var, NoisyOrVariable):
+            kinds.append(NOISY_OR)
+            blocks.append(np.array(list(var.inhibitors) + [1.0 - var.leak], dtype=np.float64))
+            continue
+
+        kinds.append(TABULAR)
+        shape = [int(cards[p]) for p in parents] + [len(var.domain)]
+        table = np.zeros(shape, dtype=np.float64)
+        for combo, dist in var.cpt.items():
+            key = tuple(domains[p].index(val) for p, val in zip(parents, combo))
+            for val, prob in dist.items():
+                table[key + (var.domain.index(val),)] = prob
+        blocks.append(table.ravel())
+
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([b.size for b in blocks])
+    parent_ptr = np.zeros(len(names) + 1, dtype=np.int64)
+    parent_ptr[1:] = np.cumsum([len(p) for p in parent_lists])
+    parent_index = np.array([p for ps in parent_lists for p in ps], dtype=np.int64)
+    kinds = np.array(kinds, dtype=np.int8)
+    elim_order = np.array(_min_degree_order(len(names), kinds, parent_lists), dtype=np.int64)
+    tables = np.concatenate(blocks) if blocks else np.zeros(0)
+
+    return CompiledBN(names, domains, kinds, cards, parent_ptr, parent_index,
+                      offsets, tables, elim_order, source_hash)
+
+
+# -----------------------------------
+# Serialization
+# -----------------------------------
+def save_compiled(cbn, path):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "model.json"), "w") as f:
+        json.dump({
+            "names": cbn.names,
+            "domains": cbn.domains,
+            "source_hash": cbn.source_hash,
+        }, f)
+    for key in ARRAY_FILES:
+        np.save(os.path.join(path, f"{key}.npy"), np.asarray(getattr(cbn, key)))
+
+
+def load_compiled(path, mmap=True):
+    with open(os.path.join(path, "model.json")) as f:
+        meta = json.load(f)
+    mode = "r" if mmap else None
+    arrays = {
+        key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mode)
+        for key in ARRAY_FILES
+    }
+    return CompiledBN(meta["names"], meta["domains"], source_hash=meta["source_hash"], **arrays)
+
+
+def load_or_compile(yaml_path, cache_dir):
+    """
+    Return the compiled network for a YAML config, reusing the cache in
+    `cache_dir` when it was compiled from identical file contents.
+    """
+    from parser import parse_yaml
+    from hurricane_bn import build_bn
+
+    with open(yaml_path, "rb") as f:
+        source_hash = hashlib.sha1(f.read()).hexdigest()
+
+    if os.path.exists(os.path.join(cache_dir, "model.json")):
+        cbn = load_compiled(cache_dir)
+        if cbn.source_hash == source_hash:
+            return cbn
+
+    n, edges, P1, weather_prior = parse_yaml(yaml_path)
+    cbn = compile_bn(build_bn(n, edges, P1, weather_prior), source_hash)
+    save_compiled(cbn, cache_dir)
+    return cbn
+
+
+# -----------------------------------
+# Variable elimination
+# -----------------------------------
+# np.einsum takes at most 32 operands; larger buckets are contracted in chunks
+_MAX_OPERANDS = 16
+
+
+def _einsum(factors, keep):
+    labels = {}
+    operands = []
+    for scope, table in factors:
+        operands.append(table)
+        operands.append([labels.setdefault(v, len(labels)) for v in scope])
+    out_scope = tuple(v for v in labels if v in keep)
+    operands.append([labels[v] for v in out_scope])
+    return out_scope, np.einsum(*operands)
+
+
+def _multiply_sum(factors, keep):
+    """Product of `factors` summed down to the variables in `keep`."""
+    scalar = np.float64(1.0)
+    tables = []
+    for scope, table in factors:
+        if scope:
+            tables.append((tuple(scope), table))
+        else:
+            scalar = scalar * table
+    if not tables:
+        return (), scalar
+
+    while len(tables) > _MAX_OPERANDS:
+        chunk, tables = tables[:_MAX_OPERANDS], tables[_MAX_OPERANDS:]
+        # sum out what no other factor (and no kept variable) still mentions
+        needed = set(keep) | {v for scope, _ in tables for v in scope}
+        tables.append(_einsum(chunk, needed))
+
+    out_scope, table = _einsum(tables, keep)
+    return out_scope, table * scalar
+
+
+def _relevant(cbn, roots):
+    # Ancestors of the query/evidence: every other variable is barren and sums to 1.
+    seen = set()
+    stack = list(roots)
+    while stack:
+        v = stack.pop()
+        if v in seen:
+            continue
+        seen.add(v)
+        stack.extend(int(p) for p in cbn.parents(v))
+    return seen
+
+
+def _noisy_or_dense(cbn, i):
+    # Full CPT of a noisy-OR; only needed when it is a hidden non-leaf variable.
+    inhibitors = cbn.cpt(i)
+    parents = [int(p) for p in cbn.parents(i)]
+    prob_false = np.asarray(inhibitors[-1], dtype=np.float64)
+    for p, q in zip(parents, inhibitors[:-1]):
+        vec = np.ones(int(cbn.cards[p]))
+        vec[cbn.value_index[p][True]] = q
+        prob_false = np.multiply.outer(prob_false, vec)
+    table = np.empty(prob_false.shape + (2,))
+    table[..., cbn.value_index[i][True]] = 1.0 - prob_false
+    table[..., cbn.value_index[i][False]] = prob_false
+    return parents + [i], table
+
+
+def _joint(cbn, evidence, negative, keep):
+    """
+    Unnormalized P(keep, evidence, negative noisy-OR findings) by variable elimination.
+    `evidence` maps variables to value indices; `negative` lists childless
+    noisy-OR variables observed False.
+    """
+    roots = set(evidence) | {int(p) for x in negative for p in cbn.parents(x)}
+    if keep is not None:
+        roots.add(keep)
+    relevant = _relevant(cbn, roots)
+
+    factors = []
+    for i in relevant:
+        if cbn.kinds[i] == NOISY_OR:
+            scope, table = _noisy_or_dense(cbn, i)
+        else:
+            scope, table = [int(p) for p in cbn.parents(i)] + [i], cbn.cpt(i)
+        factors.append((scope, table))
+
+    # Negative noisy-OR findings factorize into one unary factor per parent.
+    for x in negative:
+        inhibitors = cbn.cpt(x)
+        factors.append(((), np.asarray(inhibitors[-1])))
+        for p, q in zip(cbn.parents(x), inhibitors[:-1]):
+            p = int(p)
+            vec = np.ones(int(cbn.cards[p]))
+            vec[cbn.value_index[p][True]] = q
+            factors.append(((p,), vec))
+
+    # Restrict to the evidence
+    reduced = []
+    for scope, table in factors:
+        if any(v in evidence for v in scope):
+            index = tuple(evidence[v] if v in evidence else slice(None) for v in scope)
+            table = table[index]
+            scope = tuple(v for v in scope if v not in evidence)
+        reduced.append((tuple(scope), table))
+
+    hidden = {v for scope, _ in reduced for v in scope if v != keep}
+    for v in sorted(hidden, key=lambda x: cbn.elim_rank[x]):
+        involved = [f for f in reduced if v in f[0]]
+        rest = [f for f in reduced if v not in f[0]]
+        scope = set().union(*(f[0] for f in involved)) - {v}
+        rest.append(_multiply_sum(involved, scope))
+        reduced = rest
+
+    _scope, table = _multiply_sum(reduced, {keep})
+    return table
+
+
+def _finding_joint(cbn, evidence, negative, positive, keep):
+    # Positive noisy-OR findings by inclusion-exclusion (Quickscore):
+    # P(e, X=T) = P(e) - P(e, X=F)
+    if not positive:
+        return _joint(cbn, evidence, negative, keep)
+    x, rest = positive[0], positive[1:]
+    return (_finding_joint(cbn, evidence, negative, rest, keep)
+            - _finding_joint(cbn, evidence, negative + [x], rest, keep))
+
+
+def _split_evidence(cbn, evidence):
+    # Childless noisy-OR findings are decomposed; everything else is plain evidence.
+    reduced, negative, positive = {}, [], []
+    for v, val in cbn.encode(evidence).items():
+        if cbn.kinds[v] == NOISY_OR and not cbn.has_children[v]:
+            (positive if cbn.domains[v][val] is True else negative).append(v)
+        else:
+            reduced[v] = val
+    return reduced, negative, positive
+
+
+def joint_distributions(cbn, var_names, evidence):
+    """
+    Unnormalized P(var = value, evidence) for every variable in var_names
+    (observed variables get their 1 / 0 indicator). The evidence is encoded
+    once and P(evidence) is shared by all noisy-OR queries.
+    """
+    reduced, negative, positive = _split_evidence(cbn, evidence)
+    p_evidence = None
+    result = {}
+
+    for var_name in var_names:
+        q = cbn.index[var_name]
+        domain = cbn.domains[q]
+
+        if var_name in evidence:
+            val = evidence[var_name]
+            result[var_name] = {v: 1.0 if v == val else 0.0 for v in domain}
+            continue
+
+        if cbn.kinds[q] == NOISY_OR and not cbn.has_children[q]:
+            if p_evidence is None:
+                p_evidence = float(_finding_joint(cbn, reduced, negative, positive, None))
+            p_false = float(_finding_joint(cbn, reduced, negative + [q], positive, None))
+            # inclusion-exclusion can leave a tiny negative rounding error
+            result[var_name] = {True: max(p_evidence - p_false, 0.0), False: p_false}
+        else:
+            table = _finding_joint(cbn, reduced, negative, positive, q)
+            result[var_name] = {val: float(table[j]) for j, val in enumerate(domain)}
+
+    return result
+
+
+def posteriors(cbn, var_names, evidence):
+    """
+    query_compiled for several variables under one evidence set.
+    The exact joint values are normalized (no rounding); only evidence with
+    P(evidence) == 0 raises ZeroDivisionError, like inference.query.
+    """
+    result = {}
+    for var_name, dist in joint_distributions(cbn, var_names, evidence).items():
+        norm = sum(dist.values())
+        if norm == 0:
+            raise ZeroDivisionError(f"impossible evidence: P(evidence) = 0 for {var_name}")
+        result[var_name] = {k: v / norm for k, v in dist.items()}
+    return result
+
+
+def query_compiled(cbn, var_name, evidence):
+    """Same contract as inference.query, evaluated on a CompiledBN."""
+    return posteriors(cbn, [var_name], evidence)[var_name]
@@ -1,6 +1,5 @@
 ## Domain-specific BN construction
-from itertools import product
-from bn import Variable, BayesianNetwork
+from bn import Variable, NoisyOrVariable, BayesianNetwork
 
 
 def build_bn(n_vertices, edges, P1, weather_prior):
@@ -48,28 +47,16 @@ def build_bn(n_vertices, edges, P1, weather_prior):
         incident[e["from"]].append((i, e["weight"]))
         incident[e["to"]].append((i, e["weight"]))
 
-    # Evacuee nodes
+    # Evacuee nodes: noisy-OR over the incident flooding variables,
+    # each flooded edge independently fails to cause evacuees w.p. 1 - qi
     for v in range(n_vertices):
         parents = [f"F{i}" for i, _ in incident[v]]
-        cpt = {}
+        inhibitors = [1 - min(1.0, P1 / weight) for _, weight in incident[v]]
 
-        for combo in product([True, False], repeat=len(parents)):
-            prob_not = 1.0
-            for (edge_idx, weight), flooded in zip(incident[v], combo):
-                if flooded:
-                    qi = min(1.0, P1 / weight)
-                    prob_not *= (1 - qi)
-
-            cpt[combo] = {
-                True: 1 - prob_not,
-                False: prob_not
-            }
-
-        evac = Variable(
+        evac = NoisyOrVariable(
             f"Ev{v}",
-            [True, False],
             parents,
-            cpt
+            inhibitors
         )
         bn.add(evac)
 
@@ -34,6 +34,7 @@ def print_bn(bn, edges, n_vertices, P1):
             continue
 
         for combo in product([True, False], repeat=len(parents)):
+            assignment = dict(zip(parents, combo))
             label_parts = []
             for p, val in zip(parents, combo):
                 edge_idx = p[1:]  # F0 → 0
@@ -42,5 +43,5 @@ def print_bn(bn, edges, n_vertices, P1):
                 )
 
             label = ", ".join(label_parts)
-            prob = evac.cpt[combo][True]
+            prob = evac.prob(True, assignment)
             print(f"  P(Evacuees|{label}) = {round(prob, 4)}")
@@ -1,9 +1,20 @@
 from collections import deque
 
+import numpy as np
+
+# P(flooded | W) = min(1, multiplier * p_mild), keyed by weather value
+WEATHER_MULTIPLIERS = {"mild": 1.0, "stormy": 2.0, "extreme": 3.0}
+
 UNKNOWN, FLOODED, CLEAR = 0, 1, 2
 
 
 class BeliefMDP:
+    """
+    Beliefs are single ints: the agent position in the low bits, followed by a
+    bitmask of uncertain edges known to be FLOODED and a bitmask of uncertain
+    edges known to be CLEAR (bit i = i-th uncertain edge).
+    """
+
     def __init__(self, n, edges, start, target):
         self.n = n
         self.edges = edges
@@ -14,66 +25,105 @@ class BeliefMDP:
         self.uncertain_edges = [i for i, e in enumerate(edges) if e[3] > 0.0]
         self.edge_index = {edge_id: idx for idx, edge_id in enumerate(self.uncertain_edges)}
 
+        # belief bit layout: [clear mask | flooded mask | position]
+        self.k = len(self.uncertain_edges)
+        self.pos_bits = max(1, (n - 1).bit_length())
+        self.pos_mask = (1 << self.pos_bits) - 1
+        self.flood_shift = self.pos_bits
+        self.clear_shift = self.pos_bits + self.k
+
+        # per edge: its bit in the flooded / clear masks (0 for deterministic edges)
+        self.flood_bits = [0] * len(edges)
+        self.clear_bits = [0] * len(edges)
+        for edge_id, idx in self.edge_index.items():
+            self.flood_bits[edge_id] = 1 << (self.flood_shift + idx)
+            self.clear_bits[edge_id] = 1 << (self.clear_shift + idx)
+
         # adjacency: vertex -> list of edge indices
         self.adj = {v: [] for v in range(n)}
         for i, (u, v, *_rest) in enumerate(edges):
             self.adj[u].append(i)
             self.adj[v].append(i)
 
+    # ---------- belief encoding ----------
+
+    def encode(self, pos, flooded_mask=0, clear_mask=0):
+        return pos | (flooded_mask << self.flood_shift) | (clear_mask << self.clear_shift)
+
+    def decode(self, belief):
+        """belief -> (pos, flooded_mask, clear_mask)"""
+        all_k = (1 << self.k) - 1
+        return (
+            belief & self.pos_mask,
+            (belief >> self.flood_shift) & all_k,
+            (belief >> self.clear_shift) & all_k,
+        )
+
+    def position(self, belief):
+        return belief & self.pos_mask
+
+    def with_position(self, belief, pos):
+        return (belief & ~self.pos_mask) | pos
+
+    def knowledge(self, belief):
+        """Per-uncertain-edge status tuple (UNKNOWN / FLOODED / CLEAR), for display."""
+        _pos, flooded, clear = self.decode(belief)
+        return tuple(
+            FLOODED if flooded >> i & 1 else CLEAR if clear >> i & 1 else UNKNOWN
+            for i in range(self.k)
+        )
+
+    # ---------- MDP interface ----------
+
     def is_terminal(self, belief):
-        pos, _ = belief
-        return pos == self.target
+        return belief & self.pos_mask == self.target
 
     def start_belief(self):
-        return (self.start, tuple(UNKNOWN for _ in self.uncertain_edges))
+        return self.encode(self.start)
 
     def legal_actions(self, belief):
-        pos, knowledge = belief
-        acts = []
-        for ei in self.adj[pos]:
-            u, v, w, p = self.edges[ei]
-            if p == 0.0:
-                acts.append(ei)
-                continue
+        pos = belief & self.pos_mask
+        # known-flooded edges are blocked; deterministic edges have no flood bit
+        return [ei for ei in self.adj[pos] if not belief & self.flood_bits[ei]]
 
-            kidx = self.edge_index[ei]
-            if knowledge[kidx] == FLOODED:
-                continue  # known blocked
-            acts.append(ei)
-        return acts
+    def flood_prob(self, belief, edge):
+        """P(edge is flooded | what the belief knows); edges flood independently here."""
+        return self.edges[edge][3]
+
+    def sample_flooded(self, rng, size):
+        """(size, len(edges)) bool array of flood configurations, rng a numpy Generator."""
+        p = np.array([e[3] for e in self.edges], dtype=np.float64)
+        return rng.random((size, len(self.edges))) < p
 
     def transitions(self, belief, action_edge):
         """
         Returns list of (prob, next_belief, cost)
         """
-        pos, knowledge = belief
-        u, v, w, p = self.edges[action_edge]
+        pos = belief & self.pos_mask
+        u, v, w, _p = self.edges[action_edge]
         nxt = v if pos == u else u
+        moved = belief - pos + nxt
 
-        # deterministic edge
-        if p == 0.0:
-            return [(1.0, (nxt, knowledge), w)]
+        flood_bit = self.flood_bits[action_edge]
 
-        kidx = self.edge_index[action_edge]
-        status = knowledge[kidx]
+        # deterministic edge
+        if not flood_bit:
+            return [(1.0, moved, w)]
 
         # already known
-        if status == FLOODED:
+        if belief & flood_bit:
             return []  # illegal
-        if status == CLEAR:
-            return [(1.0, (nxt, knowledge), w)]
+        clear_bit = self.clear_bits[action_edge]
+        if belief & clear_bit:
+            return [(1.0, moved, w)]
 
         # unknown edge: two outcomes
-        k_f = list(knowledge)
-        k_f[kidx] = FLOODED
-        k_c = list(knowledge)
-        k_c[kidx] = CLEAR
-
+        p = self.flood_prob(belief, action_edge)
         # If flooded: we learn it and stay in place (cannot traverse)
         # If clear: we learn it and move
         return [
-            (p, (pos, tuple(k_f)), w),
-            (1.0 - p, (nxt, tuple(k_c)), w),
+            (p, belief | flood_bit, w),
+            (1.0 - p, moved | clear_bit, w),
         ]
 
     def reachable_beliefs(self):
@@ -96,3 +146,59 @@ class BeliefMDP:
                         q.append(nb)
 
         return list(seen)
+
+
+class CorrelatedBeliefMDP(BeliefMDP):
+    """
+    Flooding correlated through the weather, as in Assignment3's hurricane BN:
+    W ~ weather_prior and, given W, edges flood independently with
+    P(flooded | W) = min(1, multipliers[W] * p), p being the edge's mild-weather
+    probability. Observing edges updates the posterior over W, which in turn
+    changes the flood probability of the edges still unknown.
+
+    The posterior depends only on the (flooded, clear) masks, so the per-edge
+    flood probabilities are computed once per knowledge pattern and cached.
+    """
+
+    def __init__(self, n, edges, start, target, weather_prior, multipliers=None):
+        super().__init__(n, edges, start, target)
+        if multipliers is None:
+            multipliers = WEATHER_MULTIPLIERS
+        if set(weather_prior) != set(multipliers):
+            raise ValueError(f"Weather prior must cover exactly {sorted(multipliers)}, got {sorted(weather_prior)}.")
+        self.weather_prior = dict(weather_prior)
+        # matched by name, so the order of the prior's keys does not matter
+        self.weather = list(multipliers)
+        self.prior = np.array([weather_prior[w] for w in self.weather], dtype=np.float64)
+        self.multipliers = np.array([multipliers[w] for w in self.weather], dtype=np.float64)
+
+        # flood probability of every edge under every weather value
+        p = np.array([e[3] for e in edges], dtype=np.float64)
+        self.p_given_weather = np.minimum(1.0, self.multipliers[:, None] * p[None, :])
+        self._uncertain_p = self.p_given_weather[:, self.uncertain_edges]
+        self._pattern_probs = {}
+
+    def weather_posterior(self, flooded, clear):
+        """P(W | observed edges) for the given flooded / clear masks."""
+        post = self.prior.copy()
+        for idx in range(self.k):
+            if flooded >> idx & 1:
+                post *= self._uncertain_p[:, idx]
+            elif clear >> idx & 1:
+                post *= 1.0 - self._uncertain_p[:, idx]
+        total = post.sum()
+        # only reachable through a zero-probability outcome: fall back to the prior
+        return post / total if total > 0.0 else self.prior
+
+    def flood_prob(self, belief, edge):
+        pattern = belief >> self.flood_shift
+        probs = self._pattern_probs.get(pattern)
+        if probs is None:
+            _pos, flooded, clear = self.decode(belief)
+            probs = (self.weather_posterior(flooded, clear) @ self.p_given_weather).tolist()
+            self._pattern_probs[pattern] = probs
+        return probs[edge]
+
+    def sample_flooded(self, rng, size):
+        weather = rng.choice(len(self.prior), size=size, p=self.prior)
+        return rng.random((size, len(self.edges))) < self.p_given_weather[weather]
@@ -0,0 +1,157 @@
+import heapq
+import math
+from collections import deque
+
+
+def _layer_edges(mdp, flooded, clear):
+    """Split the edges of one knowledge pattern into in-layer moves and revealing edges."""
+    moves, reveals = [], []
+    for e in range(len(mdp.edges)):
+        idx = mdp.edge_index.get(e)
+        if idx is None or clear >> idx & 1:
+            moves.append(e)
+        elif not flooded >> idx & 1:
+            reveals.append(e)
+    return moves, reveals
+
+
+def _forward_layers(mdp):
+    """
+    Knowledge patterns reachable from the start, each with the positions the
+    agent can occupy in it (the same closure as reachable_beliefs), and the
+    (moves, reveals) edge split of every pattern.
+    """
+    layers = {}
+    edge_split = {}
+    explored = {}
+    queued = set()
+    pending = deque()
+
+    def enter(pattern, pos):
+        positions = layers.setdefault(pattern, set())
+        if pos not in positions:
+            positions.add(pos)
+            if pattern not in queued:
+                queued.add(pattern)
+                pending.append(pattern)
+
+    enter((0, 0), mdp.start)
+    while pending:
+        pattern = pending.popleft()
+        queued.discard(pattern)
+        flooded, clear = pattern
+        if pattern not in edge_split:
+            edge_split[pattern] = _layer_edges(mdp, flooded, clear)
+        moves, reveals = (set(es) for es in edge_split[pattern])
+
+        done = explored.setdefault(pattern, set())
+        stack = [x for x in layers[pattern] if x not in done]
+        while stack:
+            x = stack.pop()
+            if x in done:
+                continue
+            done.add(x)
+            layers[pattern].add(x)
+            if x == mdp.target:
+                continue
+            for e in mdp.adj[x]:
+                u, v, _w, _p = mdp.edges[e]
+                nxt = v if x == u else u
+                if e in reveals:
+                    bit = 1 << mdp.edge_index[e]
+                    enter((flooded | bit, clear), x)
+                    enter((flooded, clear | bit), nxt)
+                elif e in moves and nxt not in done:
+                    stack.append(nxt)
+    return layers, edge_split
+
+
+def backward_induction(mdp, gamma=0.95, eps=1e-6, stats=None):
+    """
+    Knowledge only ever moves from UNKNOWN to FLOODED/CLEAR, so the belief space
+    is layered by the set of revealed edges. Layers are solved from the most
+    informed to the least informed; inside a layer every revealing action leads
+    to an already solved layer and becomes a constant exit cost, leaving a
+    deterministic shortest-path problem over the in-layer moves, solved with a
+    Dijkstra-style label-correcting search.
+    """
+    layers, edge_split = _forward_layers(mdp)
+    solved = {}
+    V, policy = {}, {}
+
+    def value(pattern, pos):
+        return solved[pattern][pos]
+
+    for pattern in sorted(layers, key=lambda p: -bin(p[0] | p[1]).count("1")):
+        flooded, clear = pattern
+        moves, reveals = edge_split[pattern]
+
+        # best exit through a revealing action, per vertex
+        dist = [math.inf] * mdp.n
+        choice = [None] * mdp.n
+        legal = [False] * mdp.n
+        for e in reveals:
+            u, v, w, _p = mdp.edges[e]
+            p = mdp.flood_prob(mdp.encode(u, flooded, clear), e)
+            bit = 1 << mdp.edge_index[e]
+            flood_layer, clear_layer = (flooded | bit, clear), (flooded, clear | bit)
+            legal[u] = legal[v] = True
+            # outcomes never entered belong to vertices the agent cannot occupy here
+            if flood_layer not in solved or clear_layer not in solved:
+                continue
+            for x, nxt in ((u, v), (v, u)):
+                q = w + gamma * (p * value(flood_layer, x) + (1.0 - p) * value(clear_layer, nxt))
+                if q < dist[x]:
+                    dist[x], choice[x] = q, e
+
+        neighbors = [[] for _ in range(mdp.n)]
+        for e in moves:
+            u, v, w, _p = mdp.edges[e]
+            neighbors[u].append((v, w, e))
+            neighbors[v].append((u, w, e))
+            legal[u] = legal[v] = True
+
+        # target and stuck vertices (no legal action) cost nothing more
+        for x in range(mdp.n):
+            if x == mdp.target or not legal[x]:
+                dist[x], choice[x] = 0.0, None
+
+        # label-correcting Dijkstra: relax predecessors of the cheapest vertex
+        heap = [(d, x) for x, d in enumerate(dist) if d < math.inf]
+        heapq.heapify(heap)
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, w, e in neighbors[x]:
+                if y == mdp.target or not legal[y]:
+                    continue
+                nd = w + gamma * d
+                if nd < dist[y] - eps * (1.0 - gamma):
+                    dist[y], choice[y] = nd, e
+                    heapq.heappush(heap, (nd, y))
+
+        # vertices that can neither exit nor reach the target loop forever
+        loop = [x for x in range(mdp.n) if dist[x] == math.inf]
+        if loop:
+            for x in loop:
+                dist[x] = 0.0
+            delta = math.inf
+            while delta > eps:
+                delta = 0.0
+                for x in loop:
+                    nd, choice[x] = min(((w + gamma * dist[y], e) for y, w, e in neighbors[x]),
+                                        default=(0.0, None))
+                    delta = max(delta, abs(nd - dist[x]))
+                    dist[x] = nd
+
+        solved[pattern] = dist
+        for pos in layers[pattern]:
+            b = mdp.encode(pos, flooded, clear)
+            V[b] = dist[pos]
+            if choice[pos] is not None:
+                policy[b] = choice[pos]
+
+    if stats is not None:
+        stats["iterations"] = len(layers)
+    return V, policy
@@ -1,15 +1,76 @@
-from parser import parse_config
-from belief_mdp import BeliefMDP
-from value_iteration import value_iteration
-from simulator import simulate
+import argparse
+
+from parser import parse_config, parse_weather_prior
+from belief_mdp import BeliefMDP, CorrelatedBeliefMDP
+from solvers import SOLVERS, solve
+from policy_table import PolicyTable, save_policy, load_policy, mdp_signature
+from online_agent import OnlinePlanner
+from simulator import simulate, evaluate_policy
 
 def main():
-    n, edges, start, target = parse_config("environment_mdp_config.yaml")
-    mdp = BeliefMDP(n, edges, start, target)
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--config", default="environment_mdp_config.yaml")
+    arg_parser.add_argument("--solver", choices=sorted(SOLVERS) + ["online"],
+                            default="value-iteration")
+    arg_parser.add_argument("--depth", type=int, default=40, help="look-ahead depth of the online planner")
+    arg_parser.add_argument("--time-budget", type=float, default=0.5,
+                            help="seconds per decision for the online planner")
+    arg_parser.add_argument("--gamma", type=float, default=0.95,
+                            help="discount of the online planner (closer to 1 on large maps)")
+    arg_parser.add_argument("--trials", type=int, default=1)
+    arg_parser.add_argument("--correlated", action="store_true",
+                            help="flood edges through the config's weather prior instead of independently")
+    arg_parser.add_argument("--save-policy", metavar="DIR", help="save the solved policy table to DIR")
+    arg_parser.add_argument("--load-policy", metavar="DIR", help="load a saved policy table instead of solving")
+    arg_parser.add_argument("--evaluate", type=int, metavar="N",
+                            help="estimate the policy cost over N silent Monte Carlo trials")
+    arg_parser.add_argument("--processes", type=int, default=None)
+    arg_parser.add_argument("--seed", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    n, edges, start, target = parse_config(args.config)
+    if args.correlated:
+        weather_prior = parse_weather_prior(args.config)
+        if weather_prior is None:
+            arg_parser.error(f"{args.config} has no uncertainty.weather_prior")
+        mdp = CorrelatedBeliefMDP(n, edges, start, target, weather_prior)
+    else:
+        mdp = BeliefMDP(n, edges, start, target)
+
+    if args.load_policy:
+        policy = load_policy(args.load_policy, mdp=mdp)
+        print(f"Policy: {args.load_policy} | beliefs: {len(policy)} | "
+              f"solver: {policy.meta.get('solver')}")
+    elif args.solver == "online":
+        policy = OnlinePlanner(mdp, depth=args.depth, time_budget=args.time_budget,
+                               gamma=args.gamma)
+        print(f"Solver: online | depth: {args.depth} | time budget: {args.time_budget}s per step")
+    else:
+        V, policy, stats = solve(mdp, args.solver)
+        print(f"Solver: {stats['solver']} | beliefs: {stats['beliefs']} | "
+              f"iterations: {stats['iterations']} | time: {stats['time']:.4f}s")
+        policy = PolicyTable.from_policy(V, policy, meta={"solver": args.solver,
+                                                          "mdp": mdp_signature(mdp)})
+
+    if args.save_policy and isinstance(policy, PolicyTable):
+        save_policy(policy, args.save_policy)
 
-    V, policy = value_iteration(mdp)
+    if args.evaluate:
+        result = evaluate_policy(mdp, policy, trials=args.evaluate,
+                                 seed=args.seed, processes=args.processes)
+        low, high = result["ci95"]
+        pct = result["percentiles"]
+        print(f"Trials: {result['trials']} | success rate: {result['success_rate']:.4f}")
+        print(f"Cost: mean {result['mean']:.4f} (95% CI {low:.4f}..{high:.4f}) | "
+              f"std {result['std']:.4f}")
+        print("Percentiles: " + " | ".join(f"p{q}: {v:.2f}" for q, v in pct.items()))
+    else:
+        simulate(mdp, policy, trials=args.trials, seed=args.seed)
 
-    simulate(mdp, policy, trials=1)
+    if isinstance(policy, OnlinePlanner):
+        s = policy.stats
+        print(f"Online planner: decisions: {s['decisions']} | expansions: {s['expansions']} | "
+              f"deepest look-ahead: {s['max_depth']} | planning time: {s['time']:.4f}s")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+import heapq
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _Timeout(Exception):
+    pass
+
+
+class FreeSpaceHeuristic:
+    """
+    Leaf estimate for look-ahead search: the discounted shortest-path cost to the
+    target assuming every edge not known to be flooded is clear (the free-space
+    assumption). Computed with Dijkstra from the target and cached per flooded set.
+
+    Unlike OptimisticHeuristic it does not treat possibly-stuck vertices as free
+    goals, so it steers a shallow search toward the target instead of dead ends.
+    """
+
+    def __init__(self, mdp, gamma=0.95):
+        self.mdp = mdp
+        self.gamma = gamma
+        self.cache = {}
+
+    def distances(self, flooded):
+        if flooded in self.cache:
+            return self.cache[flooded]
+
+        mdp, gamma = self.mdp, self.gamma
+        dist = [math.inf] * mdp.n
+        dist[mdp.target] = 0.0
+        heap = [(0.0, mdp.target)]
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for e in mdp.adj[x]:
+                idx = mdp.edge_index.get(e)
+                if idx is not None and flooded >> idx & 1:
+                    continue
+                u, v, w, _p = mdp.edges[e]
+                y = v if x == u else u
+                nd = w + gamma * d
+                if nd < dist[y]:
+                    dist[y] = nd
+                    heapq.heappush(heap, (nd, y))
+
+        # cut off from the target: the agent ends up stuck, nothing more to pay
+        dist = [0.0 if d == math.inf else d for d in dist]
+        self.cache[flooded] = dist
+        return dist
+
+    def __call__(self, belief):
+        pos, flooded, _clear = self.mdp.decode(belief)
+        return self.distances(flooded)[pos]
+
+
+class OnlinePlanner:
+    """
+    Re-plans from the current belief at every step instead of solving the whole
+    belief MDP offline.
+
+    Each decision runs iterative-deepening expectimax over mdp.transitions(),
+    one level deeper per iteration until `depth` or the per-step `time_budget`
+    (seconds) is reached, and acts on the deepest finished iteration. Leaves are
+    scored with FreeSpaceHeuristic (any callable belief -> cost works, e.g. the
+    admissible rtdp.OptimisticHeuristic). Evaluated (belief, depth)
+    nodes are kept in an LRU of at most cache_size entries and decisions are
+    cached, both across steps and trials.
+
+    On large maps discounted costs saturate at w / (1 - gamma) a few dozen edges
+    away from the target, leaving nothing to prefer one direction over another;
+    use a gamma closer to 1 there.
+
+    Acts as the policy mapping for simulate() and evaluate_policy():
+    `belief in planner` plans (if needed) and is False when no action is available.
+    """
+
+    def __init__(self, mdp, depth=40, time_budget=0.5, gamma=0.95, heuristic=None, cache_size=1_000_000):
+        self.mdp = mdp
+        self.depth = depth
+        self.time_budget = time_budget
+        self.gamma = gamma
+        self.heuristic = heuristic or FreeSpaceHeuristic(mdp, gamma)
+        self.cache_size = cache_size
+        self.values = OrderedDict()     # (belief, depth) -> (value, action), LRU
+        self.decisions = {}  # belief -> action (None: stuck)
+        self.stats = {"decisions": 0, "expansions": 0, "max_depth": 0, "time": 0.0, "evictions": 0}
+
+    def _expectimax(self, b, d, deadline):
+        mdp = self.mdp
+        if mdp.is_terminal(b):
+            return 0.0, None
+        if d == 0:
+            return self.heuristic(b), None
+        key = (b, d)
+        if key in self.values:
+            self.values.move_to_end(key)
+            return self.values[key]
+        if time.perf_counter() > deadline:
+            raise _Timeout
+
+        self.stats["expansions"] += 1
+        best, best_a = math.inf, None
+        for a in mdp.legal_actions(b):
+            trans = mdp.transitions(b, a)
+            if not trans:
+                continue
+            q = 0.0
+            for prob, nb, cost in trans:
+                q += prob * (cost + self.gamma * self._expectimax(nb, d - 1, deadline)[0])
+            if q < best:
+                best, best_a = q, a
+        if best_a is None:
+            best = 0.0  # stuck: nothing more to pay
+        self.values[key] = (best, best_a)
+        if len(self.values) > self.cache_size:
+            self.values.popitem(last=False)
+            self.stats["evictions"] += 1
+        return best, best_a
+
+    def plan(self, belief):
+        """Action to take in belief, or None if there is none."""
+        if belief in self.decisions:
+            return self.decisions[belief]
+
+        t0 = time.perf_counter()
+        deadline = t0 + self.time_budget
+        action, reached = None, 0
+        for d in range(1, self.depth + 1):
+            try:
+                _v, action = self._expectimax(belief, d, deadline)
+            except _Timeout:
+                break
+            reached = d
+        if reached == 0:
+            # not even one level fit the budget: finish depth 1 regardless
+            _v, action = self._expectimax(belief, 1, math.inf)
+            reached = 1
+
+        self.decisions[belief] = action
+        self.stats["decisions"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], reached)
+        self.stats["time"] += time.perf_counter() - t0
+        return action
+
+    def __contains__(self, belief):
+        return self.plan(belief) is not None
+
+    def __getitem__(self, belief):
+        action = self.plan(belief)
+        if action is None:
+            raise KeyError(belief)
+        return action
+
+    def get(self, belief, default=None):
+        action = self.plan(belief)
+        return default if action is None else action
+
+    def lookup_many(self, beliefs):
+        """Action for every belief in an int64 array (-1 where there is none)."""
+        unique, inverse = np.unique(beliefs, return_inverse=True)
+        actions = np.array([self.get(int(b), -1) for b in unique], dtype=np.int64)
+        return actions[inverse]
@@ -1,5 +1,7 @@
 import yaml
 
+WEATHER = ("mild", "stormy", "extreme")
+
 
 def parse_config(path):
     with open(path) as f:
@@ -30,3 +32,27 @@ def parse_config(path):
     target = int(data["target"])
 
     return n, edges, start, target
+
+
+def parse_weather_prior(path):
+    """
+    Optional weather prior in the Assignment 3 format:
+
+      uncertainty:
+        weather_prior: {mild: ..., stormy: ..., extreme: ...}
+
+    Returns the dict, or None if the config has none. The prior must name
+    exactly mild / stormy / extreme and sum to 1.
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    prior = (data.get("uncertainty") or {}).get("weather_prior")
+    if prior is None:
+        return None
+
+    if set(prior) != set(WEATHER):
+        raise ValueError(f"weather_prior must have exactly the keys {list(WEATHER)}. Got: {list(prior)}")
+    prior = {name: float(prior[name]) for name in WEATHER}
+    if any(prob < 0 for prob in prior.values()) or abs(sum(prior.values()) - 1.0) > 1e-6:
+        raise ValueError(f"weather_prior must be a probability distribution. Got: {prior}")
+    return prior
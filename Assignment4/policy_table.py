@@ -0,0 +1,161 @@
+import json
+import os
+
+import numpy as np
+
+EMPTY = -1          # free slot in the key array (encoded beliefs are >= 0)
+NO_ACTION = -1      # belief with a value but no legal action
+_MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing
+_MASK64 = (1 << 64) - 1
+
+ARRAY_FILES = ("keys", "actions", "values")
+
+
+def mdp_signature(mdp):
+    """Identifies the MDP a saved policy belongs to."""
+    return {
+        "n": mdp.n,
+        "edges": [list(e) for e in mdp.edges],
+        "start": mdp.start,
+        "target": mdp.target,
+        "weather_prior": getattr(mdp, "weather_prior", None),
+        "multipliers": getattr(mdp, "multipliers", np.zeros(0)).tolist(),
+    }
+
+
+class PolicyTable:
+    """
+    A solved policy and value function in flat NumPy arrays.
+
+    Beliefs are stored in an open-addressing hash table (linear probing,
+    power-of-two capacity at most half full) keyed by the integer belief
+    encoding, so a lookup is O(1) and needs no Python dict:
+
+      keys[slot]      encoded belief, or EMPTY
+      actions[slot]   edge to traverse, or NO_ACTION
+      values[slot]    V(belief)
+
+    Behaves like the policy dict for simulate(): `belief in table` and
+    `table[belief]` only see beliefs that have an action.
+    """
+
+    def __init__(self, keys, actions, values, meta=None):
+        self.keys = keys
+        self.actions = actions
+        self.values = values
+        self.meta = meta or {}
+        self.capacity = len(keys)
+        self.shift = 64 - (self.capacity.bit_length() - 1)
+
+    @classmethod
+    def from_policy(cls, V, policy, meta=None):
+        beliefs = set(policy) | set(V)
+        if beliefs and max(beliefs) >= 1 << 63:
+            raise ValueError("Belief encoding does not fit in int64.")
+
+        capacity = 2
+        while capacity < 2 * len(beliefs):
+            capacity *= 2
+        table = cls(
+            np.full(capacity, EMPTY, dtype=np.int64),
+            np.full(capacity, NO_ACTION, dtype=np.int64),
+            np.full(capacity, np.nan),
+            meta,
+        )
+        for b in sorted(beliefs):
+            slot = table._slot(b)
+            table.keys[slot] = b
+            table.actions[slot] = policy.get(b, NO_ACTION)
+            table.values[slot] = V.get(b, np.nan)
+        return table
+
+    def __len__(self):
+        return int(np.count_nonzero(self.keys != EMPTY))
+
+    def _slot(self, belief):
+        """Slot holding belief, or the empty slot where it would go."""
+        slot = ((belief * _MULTIPLIER) & _MASK64) >> self.shift
+        while True:
+            key = self.keys[slot]
+            if key == belief or key == EMPTY:
+                return slot
+            slot = (slot + 1) & (self.capacity - 1)
+
+    def _find(self, belief):
+        slot = self._slot(belief)
+        return slot if self.keys[slot] == belief else None
+
+    def __contains__(self, belief):
+        slot = self._find(belief)
+        return slot is not None and self.actions[slot] != NO_ACTION
+
+    def __getitem__(self, belief):
+        slot = self._find(belief)
+        if slot is None or self.actions[slot] == NO_ACTION:
+            raise KeyError(belief)
+        return int(self.actions[slot])
+
+    def get(self, belief, default=None):
+        return self[belief] if belief in self else default
+
+    def value(self, belief):
+        slot = self._find(belief)
+        if slot is None:
+            raise KeyError(belief)
+        return float(self.values[slot])
+
+    def _slots_many(self, beliefs):
+        """Vectorized probe: slot of every belief, -1 where it is absent."""
+        beliefs = np.asarray(beliefs, dtype=np.int64)
+        slots = (beliefs.astype(np.uint64) * np.uint64(_MULTIPLIER)) >> np.uint64(self.shift)
+        slots = slots.astype(np.int64)
+        result = np.full(len(beliefs), -1, dtype=np.int64)
+        pending = np.arange(len(beliefs))
+        while len(pending):
+            keys = self.keys[slots[pending]]
+            hit = keys == beliefs[pending]
+            result[pending[hit]] = slots[pending[hit]]
+            pending = pending[~hit & (keys != EMPTY)]
+            slots[pending] = (slots[pending] + 1) & (self.capacity - 1)
+        return result
+
+    def lookup_many(self, beliefs):
+        """Action for every belief in an int64 array (NO_ACTION where unknown)."""
+        slots = self._slots_many(beliefs)
+        return np.where(slots >= 0, self.actions[slots], NO_ACTION)
+
+    def values_many(self, beliefs):
+        slots = self._slots_many(beliefs)
+        return np.where(slots >= 0, self.values[slots], np.nan)
+
+    def as_dicts(self):
+        """(V, policy) dicts, as returned by the solvers."""
+        used = np.flatnonzero(self.keys != EMPTY)
+        V = {int(self.keys[s]): float(self.values[s]) for s in used}
+        policy = {int(self.keys[s]): int(self.actions[s])
+                  for s in used if self.actions[s] != NO_ACTION}
+        return V, policy
+
+
+def save_policy(table, path):
+    """Write the table as a directory of .npy arrays plus meta.json."""
+    os.makedirs(path, exist_ok=True)
+    for name in ARRAY_FILES:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(table, name))
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(table.meta, f)
+
+
+def load_policy(path, mmap=True, mdp=None):
+    """
+    Load a saved table; arrays are memory-mapped read-only unless mmap=False.
+    If mdp is given, refuse a table that was solved for a different MDP.
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if mdp is not None and meta.get("mdp") != mdp_signature(mdp):
+        raise ValueError(f"Policy in {path} was solved for a different MDP.")
+
+    mode = "r" if mmap else None
+    arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in ARRAY_FILES]
+    return PolicyTable(*arrays, meta)
@@ -0,0 +1,186 @@
+import math
+import random
+
+
+class OptimisticHeuristic:
+    """
+    Admissible lower bound on the optimal discounted cost-to-go of a belief.
+
+    Relax the belief MDP into a deterministic graph: every edge not known to be
+    flooded is traversable, and every unknown edge also adds a self-loop of its
+    weight at both endpoints (a failed traversal pays w and stays put). Vertices
+    where the agent could end up stuck (no deterministic or known-clear edge)
+    count as free goals, since a belief without actions costs nothing afterwards.
+    Any trajectory of the belief MDP is a walk in this graph, so its value
+    h(v) = min over edges of (w + gamma * h(u)) never overestimates.
+
+    Sweeps start from 0, so every iterate is already a lower bound; values are
+    cached per knowledge pattern.
+    """
+
+    def __init__(self, mdp, gamma=0.95, max_sweeps=10_000):
+        self.mdp = mdp
+        self.gamma = gamma
+        self.max_sweeps = max_sweeps
+        self.cache = {}
+
+    def distances(self, flooded, clear):
+        key = (flooded, clear)
+        if key in self.cache:
+            return self.cache[key]
+
+        mdp, gamma = self.mdp, self.gamma
+        usable = []
+        safe = [False] * mdp.n
+        for i, (u, v, w, _p) in enumerate(mdp.edges):
+            idx = mdp.edge_index.get(i)
+            if idx is not None and flooded >> idx & 1:
+                continue  # known blocked
+            usable.append((u, v, w))
+            if idx is None or clear >> idx & 1:
+                safe[u] = safe[v] = True
+            else:
+                usable.append((u, u, w))
+                usable.append((v, v, w))
+
+        goal = [not s for s in safe]
+        goal[mdp.target] = True
+
+        h = [0.0] * mdp.n
+        for _sweep in range(self.max_sweeps):
+            changed = False
+            best = [math.inf] * mdp.n
+            for u, v, w in usable:
+                if w + gamma * h[v] < best[u]:
+                    best[u] = w + gamma * h[v]
+                if w + gamma * h[u] < best[v]:
+                    best[v] = w + gamma * h[u]
+            for x in range(mdp.n):
+                nx = 0.0 if goal[x] or best[x] == math.inf else best[x]
+                if nx > h[x] + 1e-9:
+                    changed = True
+                h[x] = nx
+            if not changed:
+                break
+
+        self.cache[key] = h
+        return h
+
+    def __call__(self, belief):
+        pos, flooded, clear = self.mdp.decode(belief)
+        return self.distances(flooded, clear)[pos]
+
+
+def lrtdp(mdp, gamma=0.95, eps=1e-6, heuristic=None, max_trials=1_000_000, max_depth=10_000,
+          seed=None, stats=None):
+    """
+    Labeled RTDP (Bonet & Geffner 2003) from mdp.start_belief().
+
+    Beliefs are generated lazily and only along greedy trials, so the search
+    touches the part of the belief space the optimal policy can reach instead of
+    enumerating reachable_beliefs(). Returns V and policy dicts over the solved
+    beliefs only; beliefs a trial touched but never labeled solved still hold
+    heuristic estimates and are left out (stats["explored"] counts them too).
+    """
+    if heuristic is None:
+        heuristic = OptimisticHeuristic(mdp, gamma)
+    rng = random.Random(seed)
+
+    V = {}
+    solved = set()
+    backups = 0
+
+    def value(b):
+        if mdp.is_terminal(b):
+            return 0.0
+        if b not in V:
+            V[b] = heuristic(b)
+        return V[b]
+
+    def greedy(b):
+        best, best_a, best_trans = math.inf, None, None
+        for a in mdp.legal_actions(b):
+            trans = mdp.transitions(b, a)
+            if not trans:
+                continue
+            q = 0.0
+            for prob, nb, cost in trans:
+                q += prob * (cost + gamma * value(nb))
+            if q < best:
+                best, best_a, best_trans = q, a, trans
+        return best, best_a, best_trans
+
+    def check_solved(b):
+        nonlocal backups
+        rv = True
+        open_list = [b]
+        closed = []
+        queued = {b}
+        while open_list:
+            s = open_list.pop()
+            closed.append(s)
+            if mdp.is_terminal(s):
+                continue
+            q, a, trans = greedy(s)
+            if a is None:
+                V[s] = 0.0  # stuck: no legal action, nothing more to pay
+                continue
+            if abs(q - value(s)) > eps:
+                rv = False
+                continue
+            for _prob, ns, _cost in trans:
+                if ns not in solved and ns not in queued:
+                    queued.add(ns)
+                    open_list.append(ns)
+
+        if rv:
+            solved.update(closed)
+        else:
+            for s in reversed(closed):
+                if not mdp.is_terminal(s):
+                    q, a, _ = greedy(s)
+                    V[s] = q if a is not None else 0.0
+                    backups += 1
+        return rv
+
+    start = mdp.start_belief()
+    trials = 0
+    while start not in solved and trials < max_trials:
+        trials += 1
+        visited = []
+        on_trial = set()
+        s = start
+        # a repeated belief means the trial is circling (e.g. target unreachable)
+        while s not in solved and s not in on_trial and len(visited) < max_depth:
+            visited.append(s)
+            on_trial.add(s)
+            if mdp.is_terminal(s):
+                break
+            q, a, trans = greedy(s)
+            if a is None:
+                break
+            V[s] = q
+            backups += 1
+            r = rng.random()
+            for prob, ns, _cost in trans:
+                r -= prob
+                if r <= 0.0:
+                    break
+            s = ns
+
+        while visited:
+            if not check_solved(visited.pop()):
+                break
+
+    policy = {}
+    for b in solved:
+        if not mdp.is_terminal(b):
+            _q, a, _ = greedy(b)
+            if a is not None:
+                policy[b] = a
+
+    if stats is not None:
+        stats["iterations"] = trials
+        stats["backups"] = backups
+        stats["explored"] = len(solved | set(V))
+    return {b: value(b) for b in solved}, policy
@@ -1,10 +1,13 @@
-import random
+from concurrent.futures import ProcessPoolExecutor
 
-UNKNOWN, FLOODED, CLEAR = 0, 1, 2
+import numpy as np
+
+from belief_mdp import UNKNOWN, FLOODED
+from policy_table import PolicyTable
 
 
 def belief_to_string(mdp, belief):
-    pos, knowledge = belief
+    pos, knowledge = mdp.position(belief), mdp.knowledge(belief)
     s = f"Position: {pos}\nBelief about edges:\n"
 
     uncertain_map = {
@@ -29,15 +32,14 @@ def belief_to_string(mdp, belief):
 
 
 
-def simulate(mdp, policy, trials=1, max_steps=50):
+def simulate(mdp, policy, trials=1, max_steps=50, seed=None):
+    rng = np.random.default_rng(seed)
     for t in range(trials):
         # Sample true flooding configuration
-        flooded = {}
-        for i, (_, _, _, p) in enumerate(mdp.edges):
-            flooded[i] = random.random() < p
+        flooded = dict(enumerate(mdp.sample_flooded(rng, 1)[0].tolist()))
 
+        belief = mdp.start_belief()
         pos = mdp.start
-        knowledge = tuple(UNKNOWN for _ in mdp.uncertain_edges)
 
         total_cost = 0.0   # ✅ NEW: accumulated cost
 
@@ -56,8 +58,6 @@ def simulate(mdp, policy, trials=1, max_steps=50):
             print(f"Step {step}")
             print(f"Total cost so far: {round(total_cost, 3)}")  # ✅ PRINT COST
 
-            belief = (pos, knowledge)
-
             # Print belief state
             print(belief_to_string(mdp, belief))
 
@@ -78,21 +78,14 @@ def simulate(mdp, policy, trials=1, max_steps=50):
             if flooded[e]:
                 print(f"Observation: Edge {e} is FLOODED → stay at {pos}")
 
-                idx = mdp.edge_index[e]
-                knowledge = list(knowledge)
-                knowledge[idx] = FLOODED
-                knowledge = tuple(knowledge)
+                belief |= mdp.flood_bits[e]
 
             else:
                 print(f"Observation: Edge {e} is CLEAR → move to {nxt}")
 
-                if e in mdp.edge_index:
-                    idx = mdp.edge_index[e]
-                    knowledge = list(knowledge)
-                    knowledge[idx] = CLEAR
-                    knowledge = tuple(knowledge)
-
+                # clear_bits is 0 for deterministic edges
                 pos = nxt
+                belief = mdp.with_position(belief | mdp.clear_bits[e], pos)
 
             step += 1
 
@@ -103,6 +96,90 @@ def simulate(mdp, policy, trials=1, max_steps=50):
             print("\nDidn't reach goal within", max_steps, "steps.")
             print("Current vertex:", pos)
             print("Final belief state:")
-            print(belief_to_string(mdp, (pos, knowledge)))
+            print(belief_to_string(mdp, belief))
             print(f"Total cost so far: {round(total_cost, 3)}")
         print("=" * 50)
+
+
+def _rollout_batch(mdp, policy, n_trials, seed, max_steps):
+    """Roll the policy forward for n_trials sampled flood configurations in lockstep."""
+    if mdp.clear_shift + mdp.k > 62:
+        raise ValueError("Belief encoding does not fit in int64; use simulate() instead.")
+
+    rng = np.random.default_rng(seed)
+    eu = np.array([e[0] for e in mdp.edges], dtype=np.int64)
+    ev = np.array([e[1] for e in mdp.edges], dtype=np.int64)
+    ew = np.array([e[2] for e in mdp.edges], dtype=np.float64)
+    flood_bits = np.array(mdp.flood_bits, dtype=np.int64)
+    clear_bits = np.array(mdp.clear_bits, dtype=np.int64)
+
+    flooded = mdp.sample_flooded(rng, n_trials)
+    beliefs = np.full(n_trials, mdp.start_belief(), dtype=np.int64)
+    cost = np.zeros(n_trials)
+    running = np.full(n_trials, mdp.start != mdp.target)
+
+    for _step in range(max_steps):
+        idx = np.flatnonzero(running)
+        if len(idx) == 0:
+            break
+
+        actions = policy.lookup_many(beliefs[idx])
+
+        stuck = actions < 0  # no available action: trial stops where it is
+        running[idx[stuck]] = False
+        idx, a = idx[~stuck], actions[~stuck]
+
+        cost[idx] += ew[a]
+        b = beliefs[idx]
+        pos = b & mdp.pos_mask
+        nxt = np.where(pos == eu[a], ev[a], eu[a])
+        blocked = flooded[idx, a]
+
+        moved = ((b & ~mdp.pos_mask) | clear_bits[a]) | nxt
+        beliefs[idx] = np.where(blocked, b | flood_bits[a], moved)
+        running[idx] = np.where(blocked, True, nxt != mdp.target)
+
+    success = (beliefs & mdp.pos_mask) == mdp.target
+    return cost, success
+
+
+def evaluate_policy(mdp, policy, trials=100_000, batch_size=10_000, max_steps=50, seed=None, processes=None):
+    """
+    Silent Monte Carlo evaluation of a policy over sampled flood configurations.
+    Trials run in NumPy batches (optionally spread over a process pool).
+    policy is a dict or anything with lookup_many (PolicyTable, OnlinePlanner).
+
+    Returns a dict with the mean / variance / 95% confidence interval and
+    percentiles of the total cost, and the fraction of trials reaching the target.
+    """
+    if isinstance(policy, dict):
+        policy = PolicyTable.from_policy({}, policy)
+
+    sizes = [min(batch_size, trials - i) for i in range(0, trials, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if processes and processes > 1:
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_rollout_batch, mdp, policy, n, s, max_steps)
+                       for n, s in zip(sizes, seeds)]
+            results = [f.result() for f in futures]
+    else:
+        results = [_rollout_batch(mdp, policy, n, s, max_steps) for n, s in zip(sizes, seeds)]
+
+    cost = np.concatenate([r[0] for r in results])
+    success = np.concatenate([r[1] for r in results])
+
+    mean = float(cost.mean())
+    var = float(cost.var(ddof=1)) if len(cost) > 1 else 0.0
+    half_width = 1.96 * (var / len(cost)) ** 0.5
+    pct = np.percentile(cost, [5, 25, 50, 75, 95])
+
+    return {
+        "trials": len(cost),
+        "mean": mean,
+        "variance": var,
+        "std": var ** 0.5,
+        "ci95": (mean - half_width, mean + half_width),
+        "percentiles": dict(zip((5, 25, 50, 75, 95), pct.tolist())),
+        "success_rate": float(success.mean()),
+    }
@@ -0,0 +1,155 @@
+import heapq
+import time
+
+import numpy as np
+
+from layered_solver import backward_induction
+from rtdp import lrtdp
+from transition_table import compile_transitions
+from value_iteration import value_iteration, value_iteration_vectorized
+
+
+def _as_dicts(table, V, best_row, updatable):
+    policy = {
+        int(table.beliefs[s]): int(table.row_action[best_row[s]])
+        for s in np.flatnonzero(updatable)
+    }
+    return {int(b): float(v) for b, v in zip(table.beliefs, V)}, policy
+
+
+def policy_iteration(mdp, gamma=0.95, max_iters=100, eval_eps=1e-10, max_sweeps=10_000, table=None, stats=None):
+    """
+    Howard's policy iteration. Each evaluation solves V = c_pi + gamma * P_pi V
+    iteratively on the CSR rows of the chosen actions (Jacobi sweeps, warm-started
+    from the previous policy's values, until no value moves by more than
+    eval_eps), so memory stays O(nnz) and no S x S matrix is ever built.
+    """
+    if table is None:
+        table = compile_transitions(mdp)
+
+    S = table.n_beliefs
+    updatable = table.has_rows & ~table.terminal
+    active = np.flatnonzero(updatable)
+    # V is exact to about gamma / (1 - gamma) * eval_eps; smaller gains are noise
+    tol = max(1e-12, 10 * eval_eps * gamma / (1 - gamma))
+
+    # initial policy: first legal action
+    chosen = table.row_ptr[:-1].copy()
+    V = np.zeros(S)
+
+    iterations = sweeps = 0
+    for iterations in range(1, max_iters + 1):
+        # ---- evaluation: sub-CSR of the chosen rows ----
+        rows = chosen[active]
+        lo, hi = table.indptr[rows], table.indptr[rows + 1]
+        lengths = hi - lo
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        gather = np.repeat(lo - starts, lengths) + np.arange(lengths.sum())
+        indices, probs = table.indices[gather], table.probs[gather]
+        cost = table.row_cost[rows]
+
+        for _ in range(max_sweeps):
+            if len(active) == 0:
+                break
+            new_v = cost + gamma * np.add.reduceat(probs * V[indices], starts)
+            delta = np.max(np.abs(new_v - V[active]))
+            V[active] = new_v
+            sweeps += 1
+            if delta < eval_eps:
+                break
+
+        # ---- improvement (keep the current action unless strictly better) ----
+        q = table.q_values(V, gamma)
+        best, best_row = table.greedy(q)
+        current_q = q[chosen[active]]
+        improve = active[best[active] < current_q - tol]
+        if len(improve) == 0:
+            break
+        chosen[improve] = best_row[improve]
+
+    if stats is not None:
+        stats["iterations"] = iterations
+        stats["sweeps"] = sweeps
+    return _as_dicts(table, V, chosen, updatable)
+
+
+def prioritized_sweeping(mdp, gamma=0.95, eps=1e-6, max_backups=10_000_000, table=None, stats=None):
+    """
+    Asynchronous value iteration that always backs up the belief with the largest
+    Bellman error, then re-prioritizes its predecessors.
+    """
+    if table is None:
+        table = compile_transitions(mdp)
+
+    S = table.n_beliefs
+    updatable = table.has_rows & ~table.terminal
+    row_ptr, indptr = table.row_ptr, table.indptr
+    indices, probs = table.indices.tolist(), table.probs.tolist()
+    row_cost = table.row_cost.tolist()
+
+    # predecessors[j] = beliefs with a row that can lead to j
+    predecessors = [set() for _ in range(S)]
+    for r in range(table.n_rows):
+        owner = int(table.row_owner[r])
+        for j in indices[indptr[r]:indptr[r + 1]]:
+            predecessors[j].add(owner)
+
+    V = [0.0] * S
+
+    def backup(s):
+        best = np.inf
+        for r in range(row_ptr[s], row_ptr[s + 1]):
+            q = row_cost[r]
+            for k in range(indptr[r], indptr[r + 1]):
+                q += gamma * probs[k] * V[indices[k]]
+            if q < best:
+                best = q
+        return best
+
+    heap = []
+    for s in np.flatnonzero(updatable):
+        err = abs(backup(s) - V[s])
+        if err > eps:
+            heapq.heappush(heap, (-err, int(s)))
+
+    backups = 0
+    while heap and backups < max_backups:
+        _neg_err, s = heapq.heappop(heap)
+        new_v = backup(s)
+        if abs(new_v - V[s]) <= eps:
+            continue  # stale entry
+        V[s] = new_v
+        backups += 1
+
+        for p in predecessors[s]:
+            if not updatable[p]:
+                continue
+            err = abs(backup(p) - V[p])
+            if err > eps:
+                heapq.heappush(heap, (-err, p))
+
+    V = np.array(V)
+    _, best_row = table.greedy(table.q_values(V, gamma))
+    if stats is not None:
+        stats["iterations"] = backups
+    return _as_dicts(table, V, best_row, updatable)
+
+
+SOLVERS = {
+    "value-iteration": value_iteration,
+    "vectorized": value_iteration_vectorized,
+    "policy-iteration": policy_iteration,
+    "prioritized-sweeping": prioritized_sweeping,
+    "lrtdp": lrtdp,
+    "backward-induction": backward_induction,
+}
+
+
+def solve(mdp, method="value-iteration"):
+    """Run one of SOLVERS and return (V, policy, stats) with iteration count and wall time."""
+    stats = {"solver": method}
+    t0 = time.perf_counter()
+    V, policy = SOLVERS[method](mdp, stats=stats)
+    stats["time"] = time.perf_counter() - t0
+    stats["beliefs"] = len(V)
+    return V, policy, stats
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class TransitionTable:
+    """
+    Reachable beliefs of a BeliefMDP enumerated once into indices 0..S-1,
+    with every (belief, legal action) pair stored as one row of a CSR matrix:
+
+      beliefs[s]                   encoded belief with index s (index[belief] -> s)
+      terminal[s]                  True for beliefs at the target
+      row_ptr[s]:row_ptr[s + 1]    rows of belief s, in legal_actions order
+      row_action[r], row_cost[r]   edge of row r and its expected immediate cost
+      indptr[r]:indptr[r + 1]      outcomes of row r: next belief indices / probs
+    """
+
+    def __init__(self, beliefs, terminal, row_ptr, row_action, row_cost, indptr, indices, probs):
+        self.beliefs = beliefs
+        self.terminal = terminal
+        self.row_ptr = row_ptr
+        self.row_action = row_action
+        self.row_cost = row_cost
+        self.indptr = indptr
+        self.indices = indices
+        self.probs = probs
+
+        self.index = {int(b): s for s, b in enumerate(beliefs)}
+        self.n_beliefs = len(beliefs)
+        self.n_rows = len(row_action)
+        # belief index of every row
+        self.row_owner = np.repeat(np.arange(self.n_beliefs), np.diff(row_ptr))
+        self.has_rows = row_ptr[:-1] < row_ptr[1:]
+
+    def expected_next(self, V):
+        """sum_j P[r, j] * V[j] for every row r."""
+        if self.n_rows == 0:
+            return np.zeros(0)
+        return np.add.reduceat(self.probs * V[self.indices], self.indptr[:-1])
+
+    def q_values(self, V, gamma):
+        return self.row_cost + gamma * self.expected_next(V)
+
+    def greedy(self, q):
+        """(best value, best row) per belief; first row wins ties, like legal_actions order."""
+        best = np.full(self.n_beliefs, np.inf)
+        best_row = np.full(self.n_beliefs, -1, dtype=np.int64)
+        starts = self.row_ptr[:-1][self.has_rows]
+        if len(starts):
+            best[self.has_rows] = np.minimum.reduceat(q, starts)
+            # lowest row index reaching its belief's minimum
+            hits = np.flatnonzero(q == best[self.row_owner])
+            owners, first = np.unique(self.row_owner[hits], return_index=True)
+            best_row[owners] = hits[first]
+        return best, best_row
+
+
+def compile_transitions(mdp):
+    beliefs = mdp.reachable_beliefs()
+    index = {b: s for s, b in enumerate(beliefs)}
+
+    terminal = np.zeros(len(beliefs), dtype=bool)
+    row_ptr = [0]
+    row_action, row_cost = [], []
+    indptr, indices, probs = [0], [], []
+
+    for s, b in enumerate(beliefs):
+        if mdp.is_terminal(b):
+            terminal[s] = True
+        else:
+            for a in mdp.legal_actions(b):
+                trans = mdp.transitions(b, a)
+                if not trans:
+                    continue
+                row_action.append(a)
+                row_cost.append(sum(prob * cost for prob, _nb, cost in trans))
+                for prob, nb, _cost in trans:
+                    indices.append(index[nb])
+                    probs.append(prob)
+                indptr.append(len(indices))
+        row_ptr.append(len(row_action))
+
+    return TransitionTable(
+        np.array(beliefs),  # int64 unless the encoding needs more bits
+        terminal,
+        np.array(row_ptr, dtype=np.int64),
+        np.array(row_action, dtype=np.int64),
+        np.array(row_cost, dtype=np.float64),
+        np.array(indptr, dtype=np.int64),
+        np.array(indices, dtype=np.int64),
+        np.array(probs, dtype=np.float64),
+    )
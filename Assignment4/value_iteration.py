@@ -1,12 +1,17 @@
 import math
 
+import numpy as np
 
-def value_iteration(mdp, gamma=0.95, eps=1e-6, max_iters=500):
+from transition_table import compile_transitions
+
+
+def value_iteration(mdp, gamma=0.95, eps=1e-6, max_iters=500, stats=None):
     beliefs = mdp.reachable_beliefs()  # IMPORTANT: reachable only
     V = {b: 0.0 for b in beliefs}
     policy = {}
 
-    for _it in range(max_iters):
+    iterations = 0
+    for iterations in range(1, max_iters + 1):
         delta = 0.0
 
         for b in beliefs:
@@ -40,4 +45,37 @@ def value_iteration(mdp, gamma=0.95, eps=1e-6, max_iters=500):
         if delta < eps:
             break
 
+    if stats is not None:
+        stats["iterations"] = iterations
     return V, policy
+
+
+def value_iteration_vectorized(mdp, gamma=0.95, eps=1e-6, max_iters=500, table=None, stats=None):
+    """
+    Same fixed point as value_iteration, but the reachable beliefs and their
+    transitions are compiled once into a TransitionTable and every sweep is a
+    sparse matrix-vector product (synchronous backups).
+    """
+    if table is None:
+        table = compile_transitions(mdp)
+
+    V = np.zeros(table.n_beliefs)
+    updatable = table.has_rows & ~table.terminal
+
+    iterations = 0
+    for iterations in range(1, max_iters + 1):
+        best, _ = table.greedy(table.q_values(V, gamma))
+        new_V = np.where(updatable, best, V)
+        delta = np.max(np.abs(new_V - V)) if len(V) else 0.0
+        V = new_V
+        if delta < eps:
+            break
+
+    if stats is not None:
+        stats["iterations"] = iterations
+    _, best_row = table.greedy(table.q_values(V, gamma))
+    policy = {
+        int(table.beliefs[s]): int(table.row_action[best_row[s]])
+        for s in np.flatnonzero(updatable)
+    }
+    return {int(b): float(v) for b, v in zip(table.beliefs, V)}, policy
@@ -2,6 +2,7 @@ from Assignments_1_2.agents.base_agent import BaseAgent
 from utils.constants import Actions
 from utils.search import SearchState, successors
 from Assignments_1_2.utils.heuristic import heuristic
+from Assignments_1_2.utils.allocation import agent_remaining_people
 import heapq
 import itertools
 
@@ -9,6 +10,7 @@ import itertools
 class RealTimeAStar(BaseAgent):
     def __init__(self, id, initial_position, expansion_limit=3):
         super().__init__(id, initial_position)
+        self.uses_allocation = True
         self.agent_type = 'A*-RealTime-Search'
         self.expansion_limit = expansion_limit  # 'L' parameter
 
@@ -21,12 +23,7 @@ class RealTimeAStar(BaseAgent):
         # 2) RTA* does not store a plan. It plans one step at a time.
 
         # Build remaining_people vector
-        n = env.n_vertices
-        remaining_people = [0] * n
-        for v, objs in enumerate(env.objects):
-            for obj in objs:
-                if obj.startswith('P'):
-                    remaining_people[v] += int(obj[1:])
+        remaining_people = agent_remaining_people(self, env)
 
         if all(count == 0 for count in remaining_people):
             return Actions.NO_OP, None
@@ -47,44 +44,67 @@ class RealTimeAStar(BaseAgent):
         open_list = []
         closed_g = {}
         counter = itertools.count()
-        expansions = 0
+        expansions = generated = max_open = tt_hits = 0
+        target = None   # the node whose first step we take
 
         h0 = heuristic(start_state, env)
         # We use f = g + h.
         heapq.heappush(open_list, (h0, next(counter), start_state))
         closed_g[start_state.key()] = 0
 
-        # Run the search loop limited by expansion_limit (L)
-        while open_list and expansions < self.expansion_limit:
-            f, _, state = heapq.heappop(open_list)
-            expansions += 1
-
-            # If we happen to find the goal within the limit, move towards it
-            if all(count == 0 for count in state.remaining_people):
-                return self.extract_next_action(state)
-
-            current_g = closed_g[state.key()]
-
-            for next_state, action_info, step_cost in successors(state, env):
-                tentative_g = current_g + step_cost
-                next_key = next_state.key()
-
-                if next_key not in closed_g or tentative_g < closed_g[next_key]:
-                    closed_g[next_key] = tentative_g
-                    h = heuristic(next_state, env)
-                    heapq.heappush(open_list, (tentative_g + h, next(counter), next_state))
-
-        # Loop finished or limit reached.
-        if not open_list:
-            # No reachable states?
-            return Actions.NO_OP, None
-
-        # Identify the most promising node currently in the open_list (lowest f)
-        # Since heapq is a min-heap, the first element is the best.
-        best_f, _, best_state = open_list[0]
-
-        # We move towards this 'best_state'
-        return self.extract_next_action(best_state)
+        try:
+            # Run the search loop limited by expansion_limit (L)
+            while open_list and expansions < self.expansion_limit:
+                f, _, state = heapq.heappop(open_list)
+                expansions += 1
+
+                # If we happen to find the goal within the limit, move towards it
+                if all(count == 0 for count in state.remaining_people):
+                    target = state
+                    return self.extract_next_action(state)
+
+                current_g = closed_g[state.key()]
+
+                for next_state, action_info, step_cost in successors(state, env):
+                    generated += 1
+                    tentative_g = current_g + step_cost
+                    next_key = next_state.key()
+
+                    if next_key not in closed_g or tentative_g < closed_g[next_key]:
+                        closed_g[next_key] = tentative_g
+                        h = heuristic(next_state, env)
+                        heapq.heappush(open_list, (tentative_g + h, next(counter), next_state))
+                    else:
+                        tt_hits += 1
+
+                if len(open_list) > max_open:
+                    max_open = len(open_list)
+
+            # Loop finished or limit reached.
+            if not open_list:
+                # No reachable states?
+                return Actions.NO_OP, None
+
+            # Identify the most promising node currently in the open_list (lowest f)
+            # Since heapq is a min-heap, the first element is the best.
+            best_f, _, best_state = open_list[0]
+            target = best_state
+
+            # We move towards this 'best_state'
+            return self.extract_next_action(best_state)
+        finally:
+            # depth: actions from the start to the node we move towards (goal or best frontier node)
+            self.search_stats = {'expanded': expansions, 'generated': generated, 'max_open': max_open,
+                                 'closed': len(closed_g), 'tt_hits': tt_hits, 'depth': self.node_depth(target)}
+
+    @staticmethod
+    def node_depth(state):
+        """Number of parent links from state back to the start state (0 for the start or None)."""
+        depth = 0
+        while state is not None and state.parent is not None:
+            depth += 1
+            state = state.parent
+        return depth
 
     def extract_next_action(self, target_state):
         """
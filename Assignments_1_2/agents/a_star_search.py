@@ -1,13 +1,15 @@
 from Assignments_1_2.agents.base_agent import BaseAgent
 from utils.constants import Actions
-from utils.search import SearchState, successors
+from utils.search import SearchState, successors, dominated
 from Assignments_1_2.utils.heuristic import heuristic
+from Assignments_1_2.utils.allocation import agent_remaining_people
 import heapq
 import itertools
 
 class AStarSearch(BaseAgent):
     def __init__(self, id, initial_position):
         super().__init__(id, initial_position)
+        self.uses_allocation = True
         self.agent_type = 'A*-Search'
         self.limit = 10000  # Global limit for expansions as per assignment
         self._current_plan = []
@@ -26,12 +28,7 @@ class AStarSearch(BaseAgent):
         # 3) Otherwise, PLAN from scratch using A* Search
 
         # Build remaining_people vector from env
-        n = env.n_vertices
-        remaining_people = [0] * n
-        for v, objs in enumerate(env.objects):
-            for obj in objs:
-                if obj.startswith('P'):
-                    remaining_people[v] += int(obj[1:])
+        remaining_people = agent_remaining_people(self, env)
 
         # If no people left anywhere -> do nothing
         if all(count == 0 for count in remaining_people):
@@ -45,8 +42,12 @@ class AStarSearch(BaseAgent):
             action_from_parent=None
         )
 
-        # Run A* search
-        plan = self.a_star_search(start_state, env)
+        # Run A* search (or reuse the plan another agent / episode found from the same state)
+        plan_cache = getattr(env, 'plan_cache', None)
+        if plan_cache is not None:
+            plan = plan_cache.plan(env, 'a-star', start_state, self.a_star_search)
+        else:
+            plan = self.a_star_search(start_state, env)
 
         # If search failed (e.g. limit reached) -> NO_OP (Terminate)
         if not plan:
@@ -61,39 +62,57 @@ class AStarSearch(BaseAgent):
         open_list = []
         closed_g = {} # Maps state key -> lowest g_score found so far
         counter = itertools.count() # Unique tie-breaker
-        expansions = 0
+        expansions = generated = max_open = tt_hits = pruned = 0
+        plan = []
+        prune = getattr(env, 'prune', False)   # dominance pruning (see utils/search.py)
 
         # f = g + h. Initially g=0.
         h0 = heuristic(start_state, env)
         heapq.heappush(open_list, (h0, next(counter), start_state))
         closed_g[start_state.key()] = 0
 
-        while open_list:
-            if expansions >= self.limit:
-                return [] # Failed: Limit reached
-
-            f, _, state = heapq.heappop(open_list)
-            expansions += 1
-
-            # Goal test
-            if all(count == 0 for count in state.remaining_people):
-                return self.reconstruct_plan(state)
-
-            current_g = closed_g[state.key()]
-
-            # Expand successors
-            for next_state, action_info, step_cost in successors(state, env):
-                tentative_g = current_g + step_cost
-                next_key = next_state.key()
-
-                # If this is a better path to next_state, record it and push to open list
-                if next_key not in closed_g or tentative_g < closed_g[next_key]:
-                    closed_g[next_key] = tentative_g
-                    h = heuristic(next_state, env)
-                    f_new = tentative_g + h
-                    heapq.heappush(open_list, (f_new, next(counter), next_state))
-
-        return [] # No solution found
+        try:
+            while open_list:
+                if expansions >= self.limit:
+                    return [] # Failed: Limit reached
+
+                f, _, state = heapq.heappop(open_list)
+                expansions += 1
+
+                # Goal test
+                if all(count == 0 for count in state.remaining_people):
+                    plan = self.reconstruct_plan(state)
+                    return plan
+
+                current_g = closed_g[state.key()]
+
+                # Expand successors
+                for next_state, action_info, step_cost in successors(state, env, prune=prune):
+                    generated += 1
+                    tentative_g = current_g + step_cost
+                    next_key = next_state.key()
+
+                    # Skip states the other kit status already reaches as cheaply
+                    if prune and dominated(next_state, tentative_g, closed_g, env):
+                        pruned += 1
+                        continue
+
+                    # If this is a better path to next_state, record it and push to open list
+                    if next_key not in closed_g or tentative_g < closed_g[next_key]:
+                        closed_g[next_key] = tentative_g
+                        h = heuristic(next_state, env)
+                        f_new = tentative_g + h
+                        heapq.heappush(open_list, (f_new, next(counter), next_state))
+                    else:
+                        tt_hits += 1
+
+                if len(open_list) > max_open:
+                    max_open = len(open_list)
+
+            return [] # No solution found
+        finally:
+            self.search_stats = {'expanded': expansions, 'generated': generated, 'max_open': max_open,
+                                 'closed': len(closed_g), 'tt_hits': tt_hits, 'pruned': pruned, 'depth': len(plan)}
 
     def reconstruct_plan(self, goal_state):
         actions = []
@@ -11,6 +11,15 @@ class BaseAgent:
         self.cooldown = 0
         self.is_rescuing = True
 
+        # People-vertices this agent plans for, set by a TaskAllocator (None = all of them);
+        # only agents with uses_allocation take part in the allocation
+        self.assigned_vertices = None
+        self.uses_allocation = False
+
+        # Filled by search-based agents on every search; see utils/instrumentation.py
+        self.search_stats = {}
+        self.instrumentation = None
+
         self.agent_type = '??'
 
     def step(self, env):
@@ -1,7 +1,8 @@
 from Assignments_1_2.agents.base_agent import BaseAgent
 from utils.constants import Actions
-from utils.search import SearchState, successors  
+from utils.search import SearchState, successors, dominated
 from Assignments_1_2.utils.heuristic import heuristic
+from Assignments_1_2.utils.allocation import agent_remaining_people
 
 import heapq
 import itertools
@@ -11,6 +12,7 @@ import itertools
 class GreedySearch(BaseAgent):
     def __init__(self, id, initial_position):
         super().__init__(id, initial_position)
+        self.uses_allocation = True
         self.agent_type = 'Greedy-Search'
         # This will hold a list of (action, info) pairs to execute step by step
         self._current_plan = []
@@ -34,12 +36,7 @@ class GreedySearch(BaseAgent):
 
         # 3a) Build remaining_people vector from env
         #     remaining_people[v] = number of people still at vertex v
-        n = env.n_vertices
-        remaining_people = [0] * n
-        for v, objs in enumerate(env.objects):
-            for obj in objs:
-                if obj.startswith('P'):
-                    remaining_people[v] += int(obj[1:])
+        remaining_people = agent_remaining_people(self, env)
 
         # If no people left anywhere → do nothing
         if all(count == 0 for count in remaining_people):
@@ -57,7 +54,12 @@ class GreedySearch(BaseAgent):
         )
 
         # 3c) Run greedy best-first search to get a full plan
-        plan = self.greedy_search(start_state, env)
+        #     (or reuse the plan another agent / episode found from the same state)
+        plan_cache = getattr(env, 'plan_cache', None)
+        if plan_cache is not None:
+            plan = plan_cache.plan(env, 'greedy-search', start_state, self.greedy_search)
+        else:
+            plan = self.greedy_search(start_state, env)
 
         # 3d) If search failed -> NO_OP
         if not plan:
@@ -81,36 +83,63 @@ class GreedySearch(BaseAgent):
 
         # Counter creates a unique tie-breaker for heap entries.
         # This prevents comparing SearchState objects when two states have the same heuristic value.
-        # Example heap entry: (h, tie_breaker, state)
+        # Example heap entry: (h, tie_breaker, g, state)
         counter = itertools.count()
 
-        # Push the start state
-        h0 = heuristic(start_state, env)
-        heapq.heappush(open_list, (h0, next(counter), start_state))
+        expansions = generated = max_open = tt_hits = pruned = 0
+        plan = []
 
-        while open_list:
-            _, _, state = heapq.heappop(open_list)
+        # Dominance pruning (see utils/search.py) needs the cheapest known cost of each state;
+        # the heap entries carry the cost of their path: (h, tie_breaker, g, state)
+        prune = getattr(env, 'prune', False)
+        best_g = {start_state.key(): 0}
 
-            state_key = state.key()
-            if state_key in visited:
-                continue
-            visited.add(state_key)
+        # Push the start state
+        h0 = heuristic(start_state, env)
+        heapq.heappush(open_list, (h0, next(counter), 0, start_state))
 
-            # Goal test: no people left anywhere
-            if all(count == 0 for count in state.remaining_people):
-                return self.reconstruct_plan(state)
+        try:
+            while open_list:
+                _, _, g, state = heapq.heappop(open_list)
 
-            # Expand successors
-            for next_state, (action, info), _ in successors(state, env):
-                next_state_key = next_state.key()
-                if next_state_key in visited:
+                state_key = state.key()
+                if state_key in visited:
+                    tt_hits += 1
                     continue
-
-                h = heuristic(next_state, env)
-                heapq.heappush(open_list, (h, next(counter), next_state))
-
-        # No plan found
-        return []
+                visited.add(state_key)
+                expansions += 1
+
+                # Goal test: no people left anywhere
+                if all(count == 0 for count in state.remaining_people):
+                    plan = self.reconstruct_plan(state)
+                    return plan
+
+                # Expand successors
+                for next_state, (action, info), step_cost in successors(state, env, prune=prune):
+                    generated += 1
+                    next_state_key = next_state.key()
+                    if next_state_key in visited:
+                        tt_hits += 1
+                        continue
+
+                    next_g = g + step_cost
+                    if prune:
+                        if dominated(next_state, next_g, best_g, env):
+                            pruned += 1
+                            continue
+                        best_g[next_state_key] = min(next_g, best_g.get(next_state_key, next_g))
+
+                    h = heuristic(next_state, env)
+                    heapq.heappush(open_list, (h, next(counter), next_g, next_state))
+
+                if len(open_list) > max_open:
+                    max_open = len(open_list)
+
+            # No plan found
+            return []
+        finally:
+            self.search_stats = {'expanded': expansions, 'generated': generated, 'max_open': max_open,
+                                 'closed': len(visited), 'tt_hits': tt_hits, 'pruned': pruned, 'depth': len(plan)}
 
 
     def reconstruct_plan(self, goal_state):
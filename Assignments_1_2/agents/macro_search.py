@@ -0,0 +1,203 @@
+from Assignments_1_2.agents.base_agent import BaseAgent
+from utils.constants import Actions
+from utils.search import SearchState
+from Assignments_1_2.utils.heuristic import heuristic
+from Assignments_1_2.utils.greedy import ShortestPathEngine
+from Assignments_1_2.utils.allocation import agent_remaining_people
+import numpy as np
+import heapq
+import itertools
+
+
+class MacroAStarSearch(BaseAgent):
+    """
+    A* over macro-actions instead of single edges:
+
+      - go to people-vertex X along the shortest passable path
+        (dry edges without the kit; every edge, amphibian-slowed, with it)
+      - go fetch the kit at K over dry edges and EQUIP it
+      - UNEQUIP here or past a flooded edge (only when moving with the kit is slower)
+      - stay one step where people are waiting (only at the start vertex)
+
+    Macro costs come from one shortest-path tree per (layer, vertex), built once
+    per environment, so the search depth is the number of targets rather than
+    the path length in edges. The chosen macros are expanded into the primitive
+    (action, info) plan the environment expects; people on the way are rescued
+    as the agent passes them, exactly like in utils/search.successors().
+    """
+
+    def __init__(self, id, initial_position):
+        super().__init__(id, initial_position)
+        self.uses_allocation = True
+        self.agent_type = 'Macro-A*-Search'
+        self.limit = 10000  # expansions, as for AStarSearch
+        self._current_plan = []
+        self._layers = None     # (dry engine, kit engine) for self._layers_env
+        self._layers_env = None
+
+    def step(self, env):
+        # 1) Respect cooldown
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return Actions.NO_OP, None
+
+        # 2) If we already have a plan, keep following it
+        if self._current_plan:
+            action, info = self._current_plan.pop(0)
+            return action, info
+
+        # 3) Otherwise, PLAN from scratch
+        remaining_people = agent_remaining_people(self, env)
+        if all(count == 0 for count in remaining_people):
+            return Actions.NO_OP, None
+
+        start_state = SearchState(
+            position=self.position,
+            remaining_people=tuple(remaining_people),
+            has_kit=self.is_holding_amphibian,
+            parent=None,
+            action_from_parent=None
+        )
+
+        plan_cache = getattr(env, 'plan_cache', None)
+        if plan_cache is not None:
+            plan = plan_cache.plan(env, 'macro-a-star', start_state, self.macro_search)
+        else:
+            plan = self.macro_search(start_state, env)
+
+        if not plan:
+            return Actions.NO_OP, None
+
+        self._current_plan = plan
+        action, info = self._current_plan.pop(0)
+        return action, info
+
+    # ---------------------------------------------------------
+    # Macro-actions
+    # ---------------------------------------------------------
+    def _engines(self, env):
+        """Shortest-path engines for the no-kit (dry edges) and with-kit (amphibian-slowed) layers."""
+        if self._layers_env is not env:
+            dry = np.where(env.flooded_flag, -1, env.weights)
+            kit = np.where(env.weights == -1, -1, env.weights * env.action_duration['amphibian'])
+            self._layers = (ShortestPathEngine(dry), ShortestPathEngine(kit))
+            self._layers_env = env
+        return self._layers
+
+    @staticmethod
+    def _drop_points(env):
+        """Vertices at the end of a flooded edge."""
+        return set(np.flatnonzero(env.flooded_flag.any(axis=1)).tolist())
+
+    @staticmethod
+    def _walk(engine, start, goal):
+        """(cost, [vertices after start ... goal]) along the shortest-path tree, or (inf, None)."""
+        dist, parent = engine.tree(start)
+        if not np.isfinite(dist[goal]):
+            return np.inf, None
+        hops = []
+        v = goal
+        while v != start:
+            hops.append(int(v))
+            v = parent[v]
+        return dist[goal], hops[::-1]
+
+    def macro_successors(self, state, env):
+        """(next_state, [primitive (action, info) ...], cost) for every macro-action from state."""
+        dry, kit = self._engines(env)
+        pos, has_kit = state.position, state.has_kit
+        succs = []
+
+        def arrive(hops, has_kit_after, extra_actions, extra_cost, cost):
+            end = hops[-1] if hops else pos
+            remaining = list(state.remaining_people)
+            for v in hops + [end]:
+                remaining[v] = 0     # rescued on arrival (or by acting there), like apply_rescue()
+            actions = [(Actions.TRAVERSE, v) for v in hops] + extra_actions
+            next_state = SearchState(end, tuple(remaining), has_kit_after, parent=state,
+                                     action_from_parent=actions)
+            succs.append((next_state, actions, cost + extra_cost))
+
+        # 0. People where we stand (the start state) are rescued by staying one step
+        if state.remaining_people[pos] > 0:
+            arrive([], has_kit, [(Actions.NO_OP, None)], 1, 0)
+
+        # 1. Go to a vertex with people
+        engine = kit if has_kit else dry
+        for x, count in enumerate(state.remaining_people):
+            if count > 0 and x != pos:
+                cost, hops = self._walk(engine, pos, x)
+                if hops is not None:
+                    arrive(hops, has_kit, [], 0, cost)
+
+        if not has_kit:
+            # 2. Fetch a kit over dry edges and equip it
+            for k in range(env.n_vertices):
+                if env.check_amphibian_availability(k):
+                    cost, hops = self._walk(dry, pos, k) if k != pos else (0, [])
+                    if hops is not None:
+                        arrive(hops, True, [(Actions.EQUIP, None)], env.action_duration['equip'], cost)
+        elif env.action_duration['amphibian'] > 1:
+            # 3. Drop the kit to move faster over dry edges: here, or past a flooded edge
+            #    (the only places where carrying it further stops paying off)
+            for y in self._drop_points(env) | {pos}:
+                cost, hops = self._walk(kit, pos, y) if y != pos else (0, [])
+                if hops is not None:
+                    arrive(hops, False, [(Actions.UNEQUIP, None)], env.action_duration['unequip'], cost)
+
+        return succs
+
+    # ---------------------------------------------------------
+    # Search
+    # ---------------------------------------------------------
+    def macro_search(self, start_state, env):
+        open_list = []
+        closed_g = {}
+        counter = itertools.count()
+        expansions = generated = max_open = tt_hits = 0
+        plan = []
+
+        heapq.heappush(open_list, (heuristic(start_state, env), next(counter), start_state))
+        closed_g[start_state.key()] = 0
+
+        try:
+            while open_list:
+                if expansions >= self.limit:
+                    return []
+
+                f, _, state = heapq.heappop(open_list)
+                expansions += 1
+
+                if all(count == 0 for count in state.remaining_people):
+                    plan = self.reconstruct_plan(state)
+                    return plan
+
+                current_g = closed_g[state.key()]
+                for next_state, _actions, step_cost in self.macro_successors(state, env):
+                    generated += 1
+                    tentative_g = current_g + step_cost
+                    next_key = next_state.key()
+
+                    if next_key not in closed_g or tentative_g < closed_g[next_key]:
+                        closed_g[next_key] = tentative_g
+                        heapq.heappush(open_list, (tentative_g + heuristic(next_state, env), next(counter), next_state))
+                    else:
+                        tt_hits += 1
+
+                if len(open_list) > max_open:
+                    max_open = len(open_list)
+
+            return []
+        finally:
+            # depth: number of primitive actions in the plan
+            self.search_stats = {'expanded': expansions, 'generated': generated, 'max_open': max_open,
+                                 'closed': len(closed_g), 'tt_hits': tt_hits, 'depth': len(plan)}
+
+    def reconstruct_plan(self, goal_state):
+        """Primitive (action, info) plan: the macros from the start to goal_state, expanded."""
+        macros = []
+        state = goal_state
+        while state.parent is not None:
+            macros.append(state.action_from_parent)
+            state = state.parent
+        return [primitive for macro in reversed(macros) for primitive in macro]
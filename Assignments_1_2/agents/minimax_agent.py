@@ -34,12 +34,15 @@ class MinimaxAgent(BaseAgent):
         # Per-decision transposition table (fast + stable)
         tt: Dict[Tuple[Any, int], float] = {}
         path = set()
+        self._counts = {"expanded": 0, "generated": 0, "tt_hits": 0}
 
         value, action = self._minimax(
             root, env, depth=0,
             alpha=float("-inf"), beta=float("inf"),
             path=path, tt=tt
         )
+        # depth-first: no open list, the transposition table plays the closed set
+        self.search_stats = {**self._counts, "max_open": None, "closed": len(tt), "depth": self.max_depth}
 
         if action is None:
             return Actions.NO_OP, None
@@ -102,15 +105,19 @@ class MinimaxAgent(BaseAgent):
         maximizing = (state.current_player() == self.id)
 
         tt_key = (key, depth)
+        counts = self._counts
         if tt_key in tt:
+            counts["tt_hits"] += 1
             return tt[tt_key], None
 
         path.add(key)
+        counts["expanded"] += 1
 
         best_action = None
         if maximizing:
             value = float("-inf")
             for next_state, action, _ in successors_game(state, env):
+                counts["generated"] += 1
                 v, _ = self._minimax(next_state, env, depth + 1, alpha, beta, path, tt)
                 if v > value:
                     value = v
@@ -121,6 +128,7 @@ class MinimaxAgent(BaseAgent):
         else:
             value = float("inf")
             for next_state, action, _ in successors_game(state, env):
+                counts["generated"] += 1
                 v, _ = self._minimax(next_state, env, depth + 1, alpha, beta, path, tt)
                 if v < value:
                     value = v
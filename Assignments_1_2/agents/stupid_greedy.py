@@ -1,11 +1,14 @@
+import numpy as np
 from Assignments_1_2.agents.base_agent import BaseAgent
 from utils.constants import Actions
-from Assignments_1_2.utils.greedy import dijkstra
+from Assignments_1_2.utils.greedy import ShortestPathEngine
 
 
 class StupidGreedy(BaseAgent):
     def __init__(self, id, initial_position):
         super().__init__(id, initial_position)
+        self._paths = None      # ShortestPathEngine over the dry edges of self._paths_env
+        self._paths_env = None
         self.agent_type = 'Stupid-Greedy'
 
     def step(self, env):
@@ -14,13 +17,6 @@ class StupidGreedy(BaseAgent):
             self.cooldown -= 1
             return Actions.NO_OP, None
 
-        # Get weights and filter edges that goes into flooded vertices. TODO: Account of flooded vertices and amphibian kit collecting. For now the function ignore it and assumes that there are no flooded vertices.
-        W = env.weights.copy()
-        for i in range(env.n_vertices):
-            for j in range(env.n_vertices):
-                if env.check_flooded(i, j):
-                    W[i, j] = -1
-
         target_vertices = []
         for i, objects in enumerate(env.objects):
             for obj in objects:
@@ -28,7 +24,15 @@ class StupidGreedy(BaseAgent):
                     target_vertices.append(i)
                     break
 
-        distance, path = dijkstra(self.position, W, target_vertices)
+        # Filter out flooded edges. TODO: Account of flooded vertices and amphibian kit collecting.
+        # Flooded edges never change, so the dry graph is built once per environment
+        # (or preprocessed into contraction hierarchies by the environment)
+        if getattr(env, 'dry_hierarchy', None) is not None:
+            self._paths = env.dry_hierarchy
+        elif self._paths_env is not env:
+            self._paths = ShortestPathEngine(np.where(env.flooded_flag, -1, env.weights))
+            self._paths_env = env
+        distance, path = self._paths.nearest(self.position, target_vertices)
 
         if len(path) > 1:
             return Actions.TRAVERSE, path[1]
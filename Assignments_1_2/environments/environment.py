@@ -1,7 +1,12 @@
 import numpy as np
 import yaml
 from utils.constants import Style, Actions
-from Assignments_1_2.utils.heuristic import precompute_distances
+from Assignments_1_2.utils.heuristic import precompute_distances, precompute_flood_distances
+from Assignments_1_2.utils.landmarks import LandmarkOracle
+from Assignments_1_2.utils.contraction import ContractionHierarchy
+from Assignments_1_2.utils.instrumentation import Instrumentation
+from Assignments_1_2.utils.allocation import TaskAllocator
+from Assignments_1_2.utils.plan_cache import PlanCache
 
 from Assignments_1_2.agents.human import Human
 from agents.stupid_greedy import StupidGreedy
@@ -10,15 +15,37 @@ from Assignments_1_2.agents.greedy_search import GreedySearch
 from agents.a_star_search import AStarSearch
 from agents.a_star_rt_search import RealTimeAStar
 from agents.minimax_agent import MinimaxAgent
+from agents.macro_search import MacroAStarSearch
 
 
 class Environment:
-    def __init__(self, yaml_path):
+    def __init__(self, yaml_path, event_driven=False, coordinate=False, plan_cache=None, landmarks=None,
+                 contraction=False, cache_dir=None, flood_aware=False, prune=False):
         try:
+            # Event-driven mode: step() jumps over ticks in which every agent is busy
+            self.event_driven = event_driven
+            # Coordinated mode: a TaskAllocator splits the people between the search agents
+            self.allocator = TaskAllocator() if coordinate else None
+            # Plans of the search agents, shared between them (pass one PlanCache to several
+            # environments to share it between episodes too, or plan_cache=False to plan without one)
+            if plan_cache is None:
+                self.plan_cache = PlanCache()
+            elif plan_cache is False:
+                self.plan_cache = None
+            else:
+                self.plan_cache = plan_cache
+            # Flood-aware mode: heuristic() reads the two-layer (no kit / with kit) distance table
+            self.flood_aware = flood_aware
+            self.kits_version = 0           # bumped whenever a kit is picked up or dropped
+            # Dominance pruning in the A* / greedy searches (see utils/search.py)
+            self.prune = prune
+            self._flood_dist = None
+            self._flood_dist_version = None
             self.steps = 1
             self.total_rescued_people = 0
             self.total_people_to_be_rescued = 0
             self.agents = []
+            self.instrumentation = None
 
             with open(yaml_path, 'r') as file:
                 configs = yaml.safe_load(file)
@@ -58,8 +85,21 @@ class Environment:
                     else:
                         raise ValueError('Error - 4th value of edge is invalid.')
 
-            # optimistic distances (used by heuristics / evaluations)
-            self.optimistic_dist = precompute_distances(self.weights)
+            # optimistic distances (used by heuristics / evaluations); with landmarks=k, an ALT
+            # oracle with k landmarks gives lower bounds instead of the O(n^2) all-pairs matrix;
+            # with contraction=True, contraction hierarchies answer the same exact distances on demand
+            # (preprocessed once per map, and stored in cache_dir if given)
+            self.dry_hierarchy = None
+            if landmarks:
+                self.optimistic_dist = LandmarkOracle(self.weights, n_landmarks=landmarks)
+            elif contraction:
+                self.optimistic_dist = ContractionHierarchy.for_graph(self.weights, cache_dir)
+            else:
+                self.optimistic_dist = precompute_distances(self.weights)
+            if contraction:
+                # shortest paths over the edges that are not flooded (StupidGreedy, Thief)
+                self.dry_hierarchy = ContractionHierarchy.for_graph(
+                    np.where(self.flooded_flag, -1, self.weights), cache_dir)
 
             # ---------------------------------------------------------
             # Populate agents
@@ -82,6 +122,8 @@ class Environment:
                     cls = RealTimeAStar
                 elif agent_type == 'minimax':
                     cls = MinimaxAgent
+                elif agent_type == 'macro-a-star':
+                    cls = MacroAStarSearch
                 else:
                     cls = Human
 
@@ -141,6 +183,7 @@ class Environment:
             # Only equip if a kit is available on ground at this vertex
             if 'K' in self.objects[pos]:
                 self.objects[pos].remove('K')
+                self.kits_version += 1
                 agent.is_holding_amphibian = True
                 agent.cooldown = self.action_duration['equip'] - 1
                 print(f'{Style.MAGENTA}Agent {agent.id} is equipping the amphibian kit '
@@ -153,12 +196,27 @@ class Environment:
             pos = agent.position
             # Drop kit on ground
             self.objects[pos].append('K')
+            self.kits_version += 1
             agent.is_holding_amphibian = False
             agent.cooldown = self.action_duration['unequip'] - 1
             print(f'{Style.MAGENTA}Agent {agent.id} is unequipping the amphibian kit '
                   f'(action duration is {self.action_duration["unequip"]} steps).{Style.RESET}')
             return
 
+    def _rescue(self, agent):
+        """The agent rescues everyone at its vertex."""
+        # remove ALL people objects at vertex (robust when multiple P exist)
+        new_objs = []
+        for obj in self.objects[agent.position]:
+            if isinstance(obj, str) and obj.startswith('P'):
+                rescued_amount = int(obj[1:])
+                agent.score += rescued_amount * 1000
+                agent.rescued_amount += rescued_amount
+                self.total_rescued_people += rescued_amount
+            else:
+                new_objs.append(obj)
+        self.objects[agent.position] = new_objs
+
     def _tick_cooldowns_and_rescue(self):
         """
         One unit of time passes in the world.
@@ -172,33 +230,59 @@ class Environment:
 
             # If rescue completes now, apply it
             if getattr(agent, "is_rescuing", False) and agent.cooldown == 0:
-                # remove ALL people objects at vertex (robust when multiple P exist)
-                new_objs = []
-                for obj in self.objects[agent.position]:
-                    if isinstance(obj, str) and obj.startswith('P'):
-                        rescued_amount = int(obj[1:])
-                        agent.score += rescued_amount * 1000
-                        agent.rescued_amount += rescued_amount
-                        self.total_rescued_people += rescued_amount
-                    else:
-                        new_objs.append(obj)
-                self.objects[agent.position] = new_objs
+                self._rescue(agent)
 
             # cost of time passing
             agent.score -= 1
 
+    @staticmethod
+    def _busy_ticks(agent):
+        """
+        Number of upcoming ticks in which the agent is still busy when asked to act.
+        Assignment 1 agents count their cooldown down in step() and the tick counts it
+        down again, so a busy tick removes 2 (or the last 1).
+        """
+        return (agent.cooldown + 1) // 2
+
+    def _skip_busy_ticks(self, ticks):
+        """
+        Apply `ticks` ticks in which every agent is busy, in bulk: exactly what
+        that many calls to step() would do, without asking the agents.
+        Only the last skipped tick can complete an action (and trigger a rescue).
+        """
+        for agent in self.agents:
+            agent.cooldown = max(agent.cooldown - 2 * ticks, 0)
+            if getattr(agent, "is_rescuing", False) and agent.cooldown == 0:
+                self._rescue(agent)
+            agent.score -= ticks
+        self.steps += ticks
+
     # ---------------------------------------------------------
     # Public API
     # ---------------------------------------------------------
-    def step(self):
+    def step(self, max_ticks=None):
         """
         Advance the simulation by 1 time unit.
 
         - Assignment 1 mode (turn_based=False): all agents are queried each step (your original behavior).
         - Assignment 2 mode (turn_based=True): only the 'turn' agent is queried; the other agent just waits,
           but time still passes for BOTH (cooldowns decrease, score decreases, rescue completion happens).
+        - Event-driven Assignment 1 mode: the ticks until the next agent is free to act are applied
+          in bulk first, then that decision tick runs normally (at most max_ticks ticks in total).
+        - Coordinated Assignment 1 mode: before the agents act, the allocator re-splits the
+          people-vertices between the search agents if they changed since the last split.
         """
         if not self.turn_based:
+            if self.event_driven:
+                skip = min(self._busy_ticks(agent) for agent in self.agents) if self.agents else 0
+                if max_ticks is not None:
+                    skip = min(skip, max_ticks - 1)
+                if skip > 0:
+                    self._skip_busy_ticks(skip)
+
+            if self.allocator is not None:
+                self.allocator.update(self)
+
             # Original behavior: everyone acts each tick
             for agent in self.agents:
                 action, info = agent.step(env=self)
@@ -224,6 +308,34 @@ class Environment:
         self.turn = 1 - self.turn
         self.steps += 1
 
+    def run(self, n_steps):
+        """Advance n_steps time units (in event-driven mode, with as few step() calls as possible)."""
+        end = self.steps + n_steps
+        while self.steps < end:
+            self.step(max_ticks=end - self.steps)
+
+    def enable_instrumentation(self):
+        """Record per-decision search statistics of every agent (see utils/instrumentation.py)."""
+        self.instrumentation = Instrumentation()
+        for agent in self.agents:
+            self.instrumentation.attach(agent)
+        return self.instrumentation
+
+    def dump_instrumentation(self, path):
+        self.instrumentation.dump(path)
+
+    def flood_distances(self):
+        """
+        precompute_flood_distances() for the kits currently lying on the map, rebuilt only when
+        a kit was picked up or dropped since the last call.
+        """
+        if self._flood_dist_version != self.kits_version:
+            kit_vertices = [v for v in range(self.n_vertices) if 'K' in self.objects[v]]
+            self._flood_dist = precompute_flood_distances(self.weights, self.flooded_flag,
+                                                          self.action_duration, kit_vertices)
+            self._flood_dist_version = self.kits_version
+        return self._flood_dist
+
     def get_adjacent_vertices(self, vertex):
         adjacents = []
         for i in range(self.n_vertices):
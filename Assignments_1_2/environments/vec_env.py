@@ -0,0 +1,311 @@
+import numpy as np
+
+from utils.constants import Actions
+from Assignments_1_2.environments.environment import Environment
+from Assignments_1_2.utils.heuristic import precompute_distances
+
+NO_INFO = -1
+
+
+class VecEnv:
+    """
+    B independent episodes of the Assignment 1 (simultaneous) environment held in
+    NumPy arrays and advanced together, one tick per step():
+
+      weights[b, u, v]     edge weight or -1        flooded[b, u, v]   flooded edge
+      people[b, v]         people waiting at v      kits[b, v]         kits lying at v
+      position[b, a]       agent a's vertex         cooldown[b, a]     busy ticks left
+      holding[b, a]        agent a holds a kit      score / rescued[b, a]
+      equip / unequip / amphibian[b]               action durations
+
+    All episodes share the vertex count and the number of agents; agent a has the
+    same role (is_rescuing) in every episode. A tick reproduces Environment.step():
+    agents act in id order (each seeing the previous agents' actions applied),
+    then cooldowns tick, rescues complete and every score pays 1.
+
+    step() takes one policy per agent index: an object with act(venv, a) returning
+    (actions[B], infos[B]) with Actions.* codes and the TRAVERSE destination
+    (NO_INFO otherwise). See VecStupidGreedy and ScalarAgentAdapter.
+    """
+
+    def __init__(self, weights, flooded, people, kits, position, is_rescuing,
+                 equip, unequip, amphibian):
+        self.weights = np.asarray(weights, dtype=np.int64)
+        self.flooded = np.asarray(flooded, dtype=bool)
+        self.people = np.asarray(people, dtype=np.int64)
+        self.kits = np.asarray(kits, dtype=np.int64)
+        self.position = np.asarray(position, dtype=np.int64)
+        self.is_rescuing = np.asarray(is_rescuing, dtype=bool)
+        self.equip = np.asarray(equip, dtype=np.int64)
+        self.unequip = np.asarray(unequip, dtype=np.int64)
+        self.amphibian = np.asarray(amphibian, dtype=np.int64)
+
+        self.n_envs, self.n_vertices = self.people.shape
+        self.n_agents = self.position.shape[1]
+        self.cooldown = np.zeros_like(self.position)
+        self.holding = np.zeros(self.position.shape, dtype=bool)
+        self.score = np.zeros_like(self.position)
+        self.rescued = np.zeros_like(self.position)
+        self.steps = 1
+        self._batch = np.arange(self.n_envs)
+
+    @classmethod
+    def from_environments(cls, envs):
+        """Batch existing (freshly loaded) Environments with the same size and agent line-up."""
+        n, n_agents = envs[0].n_vertices, len(envs[0].agents)
+        if any(e.n_vertices != n or len(e.agents) != n_agents for e in envs):
+            raise ValueError('All episodes need the same number of vertices and agents.')
+
+        people = np.zeros((len(envs), n), dtype=np.int64)
+        kits = np.zeros((len(envs), n), dtype=np.int64)
+        for b, env in enumerate(envs):
+            for v, objs in enumerate(env.objects):
+                for obj in objs:
+                    if obj.startswith('P'):
+                        people[b, v] += int(obj[1:])
+                    elif obj == 'K':
+                        kits[b, v] += 1
+
+        return cls(
+            weights=np.stack([e.weights for e in envs]),
+            flooded=np.stack([e.flooded_flag for e in envs]),
+            people=people,
+            kits=kits,
+            position=[[a.position for a in e.agents] for e in envs],
+            is_rescuing=[a.is_rescuing for a in envs[0].agents],
+            equip=[e.action_duration['equip'] for e in envs],
+            unequip=[e.action_duration['unequip'] for e in envs],
+            amphibian=[e.action_duration['amphibian'] for e in envs],
+        )
+
+    @classmethod
+    def from_yaml(cls, paths):
+        return cls.from_environments([Environment(yaml_path=p) for p in paths])
+
+    # ---------------------------------------------------------
+    # Simulation
+    # ---------------------------------------------------------
+    def _apply(self, a, actions, infos):
+        """Environment._apply_action for agent a in every episode."""
+        b = self._batch
+        pos = self.position[:, a]
+
+        # TRAVERSE (an illegal edge is a NO_OP)
+        dest = np.where(infos >= 0, infos, 0)
+        w = self.weights[b, pos, dest]
+        move = (actions == Actions.TRAVERSE) & (infos >= 0) & (w != -1)
+        duration = np.where(self.holding[:, a], self.amphibian * w, w)
+        self.cooldown[:, a] = np.where(move, duration - 1, self.cooldown[:, a])
+        self.position[:, a] = np.where(move, dest, pos)
+
+        # EQUIP (only if a kit lies here)
+        equip = (actions == Actions.EQUIP) & (self.kits[b, pos] > 0)
+        self.kits[b[equip], pos[equip]] -= 1
+        self.holding[equip, a] = True
+        self.cooldown[equip, a] = self.equip[equip] - 1
+
+        # UNEQUIP (drops a kit on the vertex)
+        unequip = actions == Actions.UNEQUIP
+        self.kits[b[unequip], pos[unequip]] += 1
+        self.holding[unequip, a] = False
+        self.cooldown[unequip, a] = self.unequip[unequip] - 1
+
+    def _tick(self):
+        """Environment._tick_cooldowns_and_rescue for every episode."""
+        b = self._batch
+        for a in range(self.n_agents):
+            self.cooldown[:, a] = np.maximum(self.cooldown[:, a] - 1, 0)
+            if self.is_rescuing[a]:
+                pos = self.position[:, a]
+                ready = self.cooldown[:, a] == 0
+                found = np.where(ready, self.people[b, pos], 0)
+                self.score[:, a] += 1000 * found
+                self.rescued[:, a] += found
+                self.people[b[ready], pos[ready]] = 0
+            self.score[:, a] -= 1
+
+    def step(self, policies):
+        for a, policy in enumerate(policies):
+            actions, infos = policy.act(self, a)
+            self._apply(a, np.asarray(actions), np.asarray(infos))
+        self._tick()
+        self.steps += 1
+
+    def run(self, policies, n_steps):
+        for _ in range(n_steps):
+            self.step(policies)
+        return self.score
+
+    # ---------------------------------------------------------
+    # Graph helpers for array agents
+    # ---------------------------------------------------------
+    def shortest_path_tree(self, sources, W=None, episodes=None):
+        """
+        Distances from sources[i] in episode episodes[i] (default: every episode; inf if
+        unreachable) and the parent of every vertex, over W (default: the episode
+        weights; -1 = no edge). W holds all B episodes; only the selected ones are solved.
+
+        Parents follow utils.greedy.dijkstra's tie-breaking: among the optimal
+        predecessors of v, the one Dijkstra pops first, i.e. the smallest
+        (distance, vertex index).
+        """
+        W = self.weights if W is None else W
+        if episodes is not None:
+            W = W[episodes]
+        n = self.n_vertices
+        batch = np.arange(len(sources))
+        edge_w = np.where(W == -1, np.inf, W.astype(float))
+
+        dist = np.full((len(sources), n), np.inf)
+        dist[batch, sources] = 0.0
+        for _ in range(n):  # Bellman-Ford rounds, batched over episodes
+            relaxed = np.minimum(dist, (dist[:, :, None] + edge_w).min(axis=1))
+            if np.array_equal(relaxed, dist):
+                break
+            dist = relaxed
+
+        # u is an optimal predecessor of v when dist[u] + w(u, v) == dist[v]; weights are
+        # integers, so (dist[u], u) ranks as the single number dist[u] * n + u
+        optimal = (dist[:, :, None] + edge_w == dist[:, None, :]) & np.isfinite(dist[:, None, :])
+        rank = np.where(optimal, dist[:, :, None] * n + np.arange(n)[None, :, None], np.inf)
+        parent = np.where(optimal.any(axis=1), rank.argmin(axis=1), -1)
+        parent[batch, sources] = -1
+        return dist, parent
+
+    def first_hop(self, sources, targets, parent):
+        """Vertex after sources[i] on the tree path to targets[i] (the target itself if adjacent)."""
+        batch = np.arange(len(sources))
+        hop = targets.copy()
+        for _ in range(self.n_vertices):
+            up = parent[batch, hop]
+            walk = (up != sources) & (up != -1) & (hop != sources)
+            if not walk.any():
+                break
+            hop = np.where(walk, up, hop)
+        return hop
+
+
+class VecStupidGreedy:
+    """
+    StupidGreedy for a whole batch: head for the nearest vertex with people over
+    dry edges, with the same nearest-target and path tie-breaking as the scalar
+    agent (and the same cooldown countdown).
+
+    The dry graph never changes within an episode, so the shortest-path tree of
+    each (episode, source vertex) is computed once, and only for agents that are
+    ready to act.
+    """
+
+    def __init__(self):
+        self._venv = None
+        self._dry = None
+        self._trees = {}    # (episode, source) -> (dist row, parent row) for self._venv
+
+    def act(self, venv, a):
+        actions = np.full(venv.n_envs, Actions.NO_OP, dtype=np.int64)
+        infos = np.full(venv.n_envs, NO_INFO, dtype=np.int64)
+
+        busy = venv.cooldown[:, a] > 0
+        venv.cooldown[busy, a] -= 1
+
+        if self._venv is not venv:
+            self._venv = venv
+            self._dry = np.where(venv.flooded, -1, venv.weights)
+            self._trees = {}
+
+        ready = np.flatnonzero(~busy)
+        if len(ready) == 0:
+            return actions, infos
+        pos = venv.position[ready, a]
+
+        missing = [i for i, b in enumerate(ready) if (b, pos[i]) not in self._trees]
+        if missing:
+            dist, parent = venv.shortest_path_tree(pos[missing], self._dry, episodes=ready[missing])
+            for j, i in enumerate(missing):
+                self._trees[ready[i], pos[i]] = dist[j], parent[j]
+        dist = np.stack([self._trees[b, p][0] for b, p in zip(ready, pos)])
+        parent = np.stack([self._trees[b, p][1] for b, p in zip(ready, pos)])
+
+        # nearest target: smallest distance, then smallest index (np.argmin keeps the first)
+        target_dist = np.where(venv.people[ready] > 0, dist, np.inf)
+        target = target_dist.argmin(axis=1)
+        found = np.isfinite(target_dist[np.arange(len(ready)), target]) & (target != pos)
+
+        hop = venv.first_hop(pos, target, parent)
+        move = ready[found]
+        actions[move] = Actions.TRAVERSE
+        infos[move] = hop[found]
+        return actions, infos
+
+
+class EpisodeView:
+    """
+    One episode of a VecEnv with the attributes and helper methods scalar agents
+    use from Environment (objects, weights, flooded_flag, optimistic_dist, ...).
+    """
+
+    get_adjacent_vertices = Environment.get_adjacent_vertices
+    check_flooded = Environment.check_flooded
+    check_amphibian_availability = Environment.check_amphibian_availability
+
+    def __init__(self, venv, b, optimistic_dist=None):
+        self.venv = venv
+        self.b = b
+        self.n_vertices = venv.n_vertices
+        self.weights = venv.weights[b]
+        self.flooded_flag = venv.flooded[b]
+        self.action_duration = {'equip': int(venv.equip[b]), 'unequip': int(venv.unequip[b]),
+                                'amphibian': int(venv.amphibian[b])}
+        self.optimistic_dist = optimistic_dist
+        self.sync()
+
+    def sync(self):
+        """Refresh the per-tick state (steps, objects) from the arrays."""
+        venv, b = self.venv, self.b
+        self.steps = venv.steps
+        self.objects = [[] for _ in range(venv.n_vertices)]
+        for v in np.flatnonzero(venv.people[b]):
+            self.objects[v].append(f'P{venv.people[b, v]}')
+        for v in np.flatnonzero(venv.kits[b]):
+            self.objects[v].extend(['K'] * int(venv.kits[b, v]))
+        for a in range(venv.n_agents):
+            self.objects[venv.position[b, a]].append(f'Agent{a}')
+
+
+class ScalarAgentAdapter:
+    """
+    Runs any scalar agent class as agent a of a VecEnv: one instance per episode,
+    synchronized from the arrays before each decision and asked through that
+    episode's EpisodeView. The view is the same object on every tick (only its
+    state is refreshed), so caches agents key on the environment, like their
+    ShortestPathEngine, survive between ticks. Slower than an array agent, but
+    works for every agent.
+    """
+
+    def __init__(self, agent_cls):
+        self.agent_cls = agent_cls
+        self.agents = None
+        self.views = None
+
+    def act(self, venv, a):
+        if self.agents is None:
+            self.agents = [self.agent_cls(id=a, initial_position=int(venv.position[b, a]))
+                           for b in range(venv.n_envs)]
+            self.views = [EpisodeView(venv, b, precompute_distances(venv.weights[b]))
+                          for b in range(venv.n_envs)]
+
+        actions = np.full(venv.n_envs, Actions.NO_OP, dtype=np.int64)
+        infos = np.full(venv.n_envs, NO_INFO, dtype=np.int64)
+        for b, agent in enumerate(self.agents):
+            view = self.views[b]
+            view.sync()
+            agent.position = int(venv.position[b, a])
+            agent.cooldown = int(venv.cooldown[b, a])
+            agent.is_holding_amphibian = bool(venv.holding[b, a])
+
+            action, info = agent.step(view)
+
+            venv.cooldown[b, a] = agent.cooldown  # agents count their own cooldown down
+            actions[b] = action
+            infos[b] = NO_INFO if info is None else info
+        return actions, infos
@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+
+
+def remaining_people(env):
+    """remaining[v] = number of people still waiting at vertex v."""
+    remaining = [0] * env.n_vertices
+    for v, objs in enumerate(env.objects):
+        for obj in objs:
+            if obj.startswith('P'):
+                remaining[v] += int(obj[1:])
+    return remaining
+
+
+def agent_remaining_people(agent, env):
+    """
+    remaining_people(env) restricted to the vertices assigned to the agent
+    (all of them when no coordinator assigned any).
+    """
+    remaining = remaining_people(env)
+    if agent.assigned_vertices is None:
+        return remaining
+    return [count if v in agent.assigned_vertices else 0 for v, count in enumerate(remaining)]
+
+
+def hungarian(cost):
+    """
+    Minimum-cost assignment for a rows x cols cost matrix with rows <= cols
+    (shortest augmenting paths with potentials, O(rows^2 * cols)).
+    Returns assigned[r] = column of row r.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_rows, n_cols = cost.shape
+    if n_rows > n_cols:
+        raise ValueError('hungarian() needs at least as many columns as rows.')
+
+    # 1-based arrays; column 0 is the virtual start of every augmenting path
+    u = np.zeros(n_rows + 1)
+    v = np.zeros(n_cols + 1)
+    row_of = np.zeros(n_cols + 1, dtype=int)   # row_of[c] = row matched to column c (0 = free)
+    way = np.zeros(n_cols + 1, dtype=int)
+
+    for r in range(1, n_rows + 1):
+        row_of[0] = r
+        c0 = 0
+        min_to = np.full(n_cols + 1, np.inf)
+        used = np.zeros(n_cols + 1, dtype=bool)
+        while row_of[c0] != 0:
+            used[c0] = True
+            r0 = row_of[c0]
+            free = ~used[1:]
+            reduced = cost[r0 - 1] - u[r0] - v[1:]
+            better = free & (reduced < min_to[1:])
+            min_to[1:][better] = reduced[better]
+            way[1:][better] = c0
+
+            candidates = np.where(free, min_to[1:], np.inf)
+            c1 = int(np.argmin(candidates)) + 1
+            delta = candidates[c1 - 1]
+
+            u[row_of[used]] += delta
+            v[used] -= delta
+            min_to[1:][free] -= delta
+            c0 = c1
+
+        # flip the augmenting path
+        while c0:
+            c1 = way[c0]
+            row_of[c0] = row_of[c1]
+            c0 = c1
+
+    assigned = [0] * n_rows
+    for c in range(1, n_cols + 1):
+        if row_of[c]:
+            assigned[row_of[c] - 1] = c - 1
+    return assigned
+
+
+def allocate(agents, targets, dist, unreachable_cost=None):
+    """
+    Split the target vertices between the agents, minimizing the summed
+    optimistic distance agent -> assigned target.
+
+    Every agent gets ceil(len(targets) / len(agents)) slots (the agent row is
+    replicated), so every target is covered and the load stays balanced.
+    dist: env.optimistic_dist (matrix or LandmarkOracle). Returns {agent.id: set(vertices)}.
+    """
+    allocation = {agent.id: set() for agent in agents}
+    targets = list(targets)
+    if not agents or not targets:
+        return allocation
+
+    capacity = math.ceil(len(targets) / len(agents))
+    slots = [agent for agent in agents for _ in range(capacity)]
+
+    cost = np.array([[dist[agent.position][t] for agent in slots] for t in targets], dtype=float)
+    finite = cost[np.isfinite(cost)]
+    if unreachable_cost is None:
+        # larger than any real assignment, so an unreachable target is only given out if it must be
+        unreachable_cost = (finite.max() + 1) * len(targets) if finite.size else 1.0
+    cost[~np.isfinite(cost)] = unreachable_cost
+
+    # rows = targets (never more than the slots)
+    for t, slot in zip(targets, hungarian(cost)):
+        allocation[slots[slot].id].add(t)
+    return allocation
+
+
+class TaskAllocator:
+    """
+    Coordinator for Assignment 1 (simultaneous) mode.
+
+    Whenever the set of vertices with people changes, the people-vertices are
+    split between the participating agents (allocate()) and written to
+    agent.assigned_vertices; each agent's planner then only plans for its own
+    subset instead of every agent chasing every person. An agent whose
+    assignment changed drops the plan it was following.
+    """
+
+    def __init__(self):
+        self.targets = None
+        self.allocation = {}
+        self.reallocations = 0
+
+    @staticmethod
+    def participants(env):
+        return [agent for agent in env.agents if agent.is_rescuing and agent.uses_allocation]
+
+    def update(self, env):
+        remaining = remaining_people(env)
+        targets = frozenset(v for v, count in enumerate(remaining) if count > 0)
+        if targets == self.targets:
+            return False
+        self.targets = targets
+
+        allocation = allocate(self.participants(env), sorted(targets), env.optimistic_dist)
+        for agent in self.participants(env):
+            assigned = allocation[agent.id]
+            if assigned != agent.assigned_vertices and hasattr(agent, '_current_plan'):
+                agent._current_plan = []
+            agent.assigned_vertices = assigned
+        self.allocation = allocation
+        self.reallocations += 1
+        return True
@@ -0,0 +1,266 @@
+import hashlib
+import heapq
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+
+def weights_hash(W):
+    W = np.ascontiguousarray(W, dtype=np.int64)
+    return hashlib.blake2b(W.tobytes() + repr(W.shape).encode(), digest_size=16).hexdigest()
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over one undirected graph, for exact shortest paths.
+
+    W: numpy array shape (n, n), W[i, j] = weight >= 0, or -1 if no edge.
+    Preprocessing contracts the vertices one by one (cheapest first by edge
+    difference); whenever the only shortest path between two neighbors of the
+    contracted vertex ran through it, a shortcut edge remembering that middle
+    vertex is added. A query is then two small Dijkstra searches that only
+    climb to higher-ranked vertices and meet at the top:
+
+      distance(u, v)          -> exact distance (inf if unreachable)
+      path(u, v)              -> vertex list u ... v (shortcuts unpacked), [] if unreachable
+      nearest(start, targets) -> (distance, path) like ShortestPathEngine.nearest
+
+    ch[u][v] reads like a row of the all-pairs matrix (env.optimistic_dist).
+    Distance answers are kept in an LRU of cache_size entries.
+
+    for_graph() stores the preprocessed hierarchy in cache_dir, keyed by the
+    weights, so each map is contracted once.
+    """
+
+    def __init__(self, n, rank, edges, cache_size=65536):
+        """rank[v]: contraction order; edges: (u, v, w, middle) with middle = -1 for original edges."""
+        self.n = n
+        self.rank = [int(r) for r in rank]
+        self.edges = edges
+        self.up = [[] for _ in range(n)]        # up[u] = [(v, w)] with rank[v] > rank[u]
+        self.middle = {}
+        for u, v, w, mid in edges:
+            u, v = int(u), int(v)
+            low, high = (u, v) if self.rank[u] < self.rank[v] else (v, u)
+            self.up[low].append((high, w))
+            self.middle[low, high] = int(mid)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    # ---------------------------------------------------------
+    # Preprocessing
+    # ---------------------------------------------------------
+    @classmethod
+    def build(cls, W, witness_limit=64, cache_size=65536):
+        """Contract every vertex of W; witness searches settle at most witness_limit vertices."""
+        W = np.asarray(W)
+        n = W.shape[0]
+        adj = [dict() for _ in range(n)]          # remaining graph: adj[u][v] = (w, middle)
+        rows, cols = np.nonzero(W != -1)
+        for u, v, w in zip(rows.tolist(), cols.tolist(), W[rows, cols].tolist()):
+            if u != v and (v not in adj[u] or w < adj[u][v][0]):
+                adj[u][v] = (w, -1)
+
+        def witness_dist(source, avoid, limit):
+            """Shortest source -> x distances in the remaining graph without `avoid`, up to limit."""
+            dist = {source: 0}
+            pq = [(0, source)]
+            settled = 0
+            while pq and settled < witness_limit:
+                d, x = heapq.heappop(pq)
+                if d > limit:
+                    break
+                if d > dist[x]:
+                    continue
+                settled += 1
+                for y, (w, _mid) in adj[x].items():
+                    if y == avoid:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(y, math.inf):
+                        dist[y] = nd
+                        heapq.heappush(pq, (nd, y))
+            return dist
+
+        def shortcuts(v):
+            """Shortcuts (u, x, w) that contracting v would need."""
+            neighbors = list(adj[v].items())
+            needed = []
+            for i, (u, (wu, _)) in enumerate(neighbors):
+                limit = wu + max((wx for _x, (wx, _) in neighbors[i + 1:]), default=0)
+                witness = witness_dist(u, v, limit)
+                for x, (wx, _) in neighbors[i + 1:]:
+                    through = wu + wx
+                    if witness.get(x, math.inf) > through:
+                        needed.append((u, x, through))
+            return needed
+
+        contracted_neighbors = [0] * n
+
+        def priority(v):
+            return len(shortcuts(v)) - len(adj[v]) + contracted_neighbors[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = [0] * n
+        edges = []
+        order = 0
+        while heap:
+            _p, v = heapq.heappop(heap)
+            # lazy update: re-check the priority, contract only if v is still the cheapest
+            p = priority(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+
+            for u, x, w in shortcuts(v):
+                if x not in adj[u] or w < adj[u][x][0]:
+                    adj[u][x] = adj[x][u] = (w, v)
+            for u, (w, mid) in adj[v].items():
+                edges.append((v, u, w, mid))
+                del adj[u][v]
+                contracted_neighbors[u] += 1
+            adj[v] = {}
+            rank[v] = order
+            order += 1
+
+        return cls(n, rank, edges, cache_size)
+
+    @classmethod
+    def for_graph(cls, W, cache_dir=None, **kwargs):
+        """Hierarchy for W, loaded from cache_dir if this graph was contracted before."""
+        if cache_dir is None:
+            return cls.build(W, **kwargs)
+        path = os.path.join(cache_dir, f'ch_{weights_hash(W)}.npz')
+        if os.path.exists(path):
+            return cls.load(path)
+        hierarchy = cls.build(W, **kwargs)
+        os.makedirs(cache_dir, exist_ok=True)
+        hierarchy.save(path)
+        return hierarchy
+
+    def save(self, path):
+        edges = np.array(self.edges, dtype=np.int64).reshape(-1, 4)
+        np.savez_compressed(path, n=self.n, rank=np.array(self.rank, dtype=np.int64), edges=edges)
+
+    @classmethod
+    def load(cls, path, cache_size=65536):
+        data = np.load(path)
+        edges = [tuple(e) for e in data['edges'].tolist()]
+        return cls(int(data['n']), data['rank'], edges, cache_size)
+
+    # ---------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------
+    def _meet(self, u, v):
+        """
+        Upward searches from u and v, alternating, until neither queue can still
+        improve the best meeting vertex. A vertex reached more cheaply from a
+        higher neighbor is stalled (its edges cannot lie on a shortest path).
+        Returns (distance, meeting vertex, forward parents, backward parents).
+        """
+        dist = ({u: 0}, {v: 0})
+        parent = ({u: -1}, {v: -1})
+        queues = ([(0, u)], [(0, v)])
+        best, top = (0, u) if u == v else (math.inf, -1)
+
+        side = 0
+        while queues[0] or queues[1]:
+            if not queues[side]:
+                side = 1 - side
+            d, x = heapq.heappop(queues[side])
+            mine, other = dist[side], dist[1 - side]
+            if d > mine[x]:
+                side = 1 - side
+                continue
+            if d >= best and (not queues[1 - side] or queues[1 - side][0][0] >= best):
+                break
+            if x in other and d + other[x] < best:
+                best, top = d + other[x], x
+
+            if not any(mine.get(y, math.inf) + w < d for y, w in self.up[x]):   # stall-on-demand
+                for y, w in self.up[x]:
+                    nd = d + w
+                    if nd < mine.get(y, math.inf):
+                        mine[y] = nd
+                        parent[side][y] = x
+                        heapq.heappush(queues[side], (nd, y))
+            side = 1 - side
+        return best, top, parent[0], parent[1]
+
+    def distance(self, u, v):
+        key = (u, v) if u <= v else (v, u)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+
+        d = float(self._meet(u, v)[0])
+        self._cache[key] = d
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return d
+
+    def _unpack(self, a, b):
+        """Original vertices of the (possibly shortcut) edge a-b, from a to b."""
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        mid = self.middle[low, high]
+        if mid == -1:
+            return [a, b]
+        return self._unpack(a, mid) + self._unpack(mid, b)[1:]
+
+    def path(self, u, v):
+        best, top, f_parent, b_parent = self._meet(u, v)
+        if best == math.inf:
+            return []
+        up_path = [top]
+        while f_parent[up_path[-1]] != -1:
+            up_path.append(f_parent[up_path[-1]])
+        up_path.reverse()                    # u ... top
+        down_path = [top]
+        while b_parent[down_path[-1]] != -1:
+            down_path.append(b_parent[down_path[-1]])   # top ... v
+
+        hops = up_path + down_path[1:]
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            path.extend(self._unpack(a, b)[1:])
+        return path
+
+    def nearest(self, start, targets):
+        """(distance, path) to the closest target (ties: lowest index), or (inf, []) if none is reachable."""
+        if start in targets:
+            return 0.0, [start]
+        best, goal = math.inf, None
+        for t in sorted(targets):
+            d = self.distance(start, t)
+            if d < best:
+                best, goal = d, t
+        if goal is None:
+            return np.inf, []
+        return best, self.path(start, goal)
+
+    def __getitem__(self, u):
+        return _HierarchyRow(self, u)
+
+    def stats(self):
+        shortcuts = sum(1 for e in self.edges if e[3] != -1)
+        return {'vertices': self.n, 'edges': len(self.edges), 'shortcuts': shortcuts,
+                'cached': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
+
+class _HierarchyRow:
+    """ch[u]: indexable like a row of the all-pairs matrix, row[v] = distance(u, v)."""
+    __slots__ = ('hierarchy', 'u')
+
+    def __init__(self, hierarchy, u):
+        self.hierarchy = hierarchy
+        self.u = u
+
+    def __getitem__(self, v):
+        return self.hierarchy.distance(self.u, v)
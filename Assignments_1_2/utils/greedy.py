@@ -13,46 +13,139 @@ def reconstruct_path(parent, start, goal):
     return path[::-1]
 
 
-def dijkstra(start, W, targets):
+class ShortestPathEngine:
     """
-    Undirected graph.
-    W: numpy array shape (n, n)
-       W[i, j] = weight >= 0, or -1 if no edge
-    targets: list of target node indices
-    flooded: list of flooded vertices
+    Dijkstra bound to one undirected graph, for agents that query it every tick.
+
+    W: numpy array shape (n, n), W[i, j] = weight >= 0, or -1 if no edge.
+    The graph is turned into neighbor lists once; distance / parent buffers are
+    allocated once and reused through a visit stamp. Queries:
+
+      nearest(start, targets)    -> (distance, path) to the closest target
+      distances(start, targets)  -> {target: distance} for the reachable targets
+      tree(start)                -> (dist, parent) arrays of the full shortest-path tree
+
+    Ties match the original dijkstra(): the heap orders (distance, vertex), so the
+    closest target with the smallest index wins and a vertex keeps the first
+    predecessor that reached it with its final distance.
+
+    Results are cached per (query, start) until the target set or the graph
+    (set_graph) changes.
     """
-    W = np.asarray(W)
-    n = W.shape[0]
 
-    targets = set(targets)
+    def __init__(self, W):
+        self.set_graph(W)
+
+    def set_graph(self, W):
+        W = np.asarray(W)
+        self.n = W.shape[0]
+        self.neighbors = [[] for _ in range(self.n)]
+        rows, cols = np.nonzero(W != -1)
+        for u, v, w in zip(rows.tolist(), cols.tolist(), W[rows, cols].tolist()):
+            self.neighbors[u].append((v, w))
+        self._dist = [np.inf] * self.n
+        self._parent = [-1] * self.n
+        self._seen = [0] * self.n
+        self._stamp = 0
+        self._cache = {}
+        self._targets = None
+        self.hits = self.misses = 0
+
+    def _cached(self, key, targets, compute):
+        if targets != self._targets:
+            self._cache.clear()
+            self._targets = targets
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+        result = self._cache[key] = compute()
+        return result
+
+    def _search(self, start, targets, stop_at_first):
+        """
+        One Dijkstra pass from start. Stops at the first target popped
+        (stop_at_first) or once every target is settled; returns the settled targets.
+        """
+        self._stamp += 1
+        stamp, seen, dist, parent = self._stamp, self._seen, self._dist, self._parent
+        neighbors = self.neighbors
+
+        seen[start] = stamp
+        dist[start] = 0.0
+        parent[start] = -1
+        settled = []
+        left = len(targets)
+
+        pq = [(0.0, start)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue  # stale entry
 
-    dist = np.full(n, np.inf)
-    parent = np.full(n, -1, dtype=int)
-    dist[start] = 0
+            if u in targets:
+                settled.append(u)
+                left -= 1
+                if stop_at_first or left == 0:
+                    break
 
-    pq = [(0.0, start)]
+            for v, w in neighbors[u]:
+                nd = d + w
+                if seen[v] != stamp or nd < dist[v]:
+                    seen[v] = stamp
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(pq, (nd, v))
+        return settled
 
-    while pq:
-        d, u = heapq.heappop(pq)
+    def _path(self, start, goal):
+        path = [goal]
+        while path[-1] != start:
+            path.append(self._parent[path[-1]])
+        return path[::-1]
 
-        # Greedy: first popped target = closest target
-        if u in targets:
-            return float(d), reconstruct_path(parent, start, u)
+    def nearest(self, start, targets):
+        """(distance, path) to the closest target, or (inf, []) if none is reachable."""
+        targets = frozenset(targets)
 
-        if d > dist[u]:
-            continue
+        def compute():
+            settled = self._search(start, targets, stop_at_first=True)
+            if not settled:
+                return np.inf, []
+            goal = settled[0]
+            return float(self._dist[goal]), self._path(start, goal)
 
-        # Vectorized neighbor access:
-        # valid neighbors have W[u] != -1
-        neighbors = np.where(W[u] != -1)[0]
+        return self._cached(('nearest', start), targets, compute)
 
-        for v in neighbors:
-            w = W[u, v]
-            nd = d + w
+    def distances(self, start, targets):
+        """{target: distance} for every target reachable from start, in one pass."""
+        targets = frozenset(targets)
 
-            if nd < dist[v]:
-                dist[v] = nd
-                parent[v] = u
-                heapq.heappush(pq, (nd, v))
+        def compute():
+            return {t: float(self._dist[t]) for t in self._search(start, targets, stop_at_first=False)}
 
-    return np.inf, []
+        return self._cached(('distances', start), targets, compute)
+
+    def tree(self, start):
+        """Full shortest-path tree: dist (inf if unreachable) and parent (-1 for start / unreachable)."""
+
+        def compute():
+            self._search(start, frozenset(), stop_at_first=False)
+            reached = np.array(self._seen) == self._stamp
+            dist = np.where(reached, np.array(self._dist, dtype=float), np.inf)
+            parent = np.where(reached, np.array(self._parent), -1)
+            return dist, parent
+
+        return self._cached(('tree', start), self._targets, compute)
+
+
+def dijkstra(start, W, targets):
+    """
+    Undirected graph.
+    W: numpy array shape (n, n)
+       W[i, j] = weight >= 0, or -1 if no edge
+    targets: list of target node indices
+
+    One-off query; agents that ask every tick should keep a ShortestPathEngine.
+    """
+    return ShortestPathEngine(W).nearest(start, targets)
@@ -1,6 +1,8 @@
 import heapq
 import numpy as np
 
+from Assignments_1_2.utils.greedy import ShortestPathEngine
+
 # Admissible optimistic heuristic for Part 2
 # state: search state object (created and managed by the search agents of part 2)
 # env: reference to environment
@@ -9,11 +11,18 @@ def heuristic(state, env):
     if all(count == 0 for count in state.remaining_people):    # if there are no people to rescue in any vertex - return 0 and agent will know that reached goal state
         return 0.0
 
+    # flood-aware environments: exact cost of reaching v given where we are and whether we hold
+    # a kit (flooded edges need one); otherwise the optimistic distance ignoring flooding & kits
+    if getattr(env, 'flood_aware', False):
+        dist_from = env.flood_distances()[state.position + env.n_vertices * state.has_kit]
+    else:
+        dist_from = env.optimistic_dist[state.position]
+
     best = float('inf')
 
     for v, count in enumerate(state.remaining_people):
         if count > 0:     # there are people left at vertex v
-            d = env.optimistic_dist[state.position][v]
+            d = dist_from[v]
             best = min(best, d)
 
     return best
@@ -49,3 +58,27 @@ def precompute_distances(weights):
         dist_all[s, :] = dist
 
     return dist_all
+
+
+# Flood-aware distances: the graph is doubled into a "no kit" layer (vertex u, flooded edges
+# removed) and a "with kit" layer (vertex n + u, every edge, weight * amphibian), joined by
+# EQUIP (u -> n + u, only where a kit lies) and UNEQUIP (n + u -> u, anywhere).
+# Returns dist shape (2n, n): dist[u + n * has_kit][v] = least time to stand on v, with or without
+# a kit, so it accounts for detouring to the nearest kit. Kits move when agents (un)equip, so the
+# environment rebuilds it whenever they do.
+def precompute_flood_distances(weights, flooded, action_duration, kit_vertices):
+    n = weights.shape[0]
+    edge = weights != -1
+    product = np.full((2 * n, 2 * n), -1, dtype=weights.dtype)
+    product[:n, :n] = np.where(edge & ~flooded, weights, -1)                                # no kit
+    product[n:, n:] = np.where(edge, weights * action_duration['amphibian'], -1)           # with kit
+    product[np.arange(n) + n, np.arange(n)] = action_duration['unequip']
+    for k in kit_vertices:
+        product[k, n + k] = action_duration['equip']
+
+    engine = ShortestPathEngine(product)
+    dist_all = np.empty((2 * n, n))
+    for s in range(2 * n):
+        dist, _parent = engine.tree(s)
+        dist_all[s] = np.minimum(dist[:n], dist[n:])
+    return dist_all
@@ -0,0 +1,92 @@
+import json
+import time
+
+
+def effective_branching_factor(generated, depth, tol=1e-6):
+    """
+    b* such that a uniform tree of the solution depth holds the generated nodes:
+    generated + 1 = 1 + b* + b*^2 + ... + b*^depth  (solved by bisection).
+    """
+    if not depth or generated <= 0:
+        return None
+
+    def tree_size(b):
+        return sum(b ** i for i in range(1, depth + 1))
+
+    lo, hi = 0.0, max(1.0, float(generated))
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if tree_size(mid) < generated:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+class Instrumentation:
+    """
+    Per-decision search statistics for agents.
+
+    attach(agent) wraps agent.step; each call appends one record with the wall
+    time of the decision and whatever the agent's search left in
+    agent.search_stats (expanded, generated, max_open, closed, tt_hits, pruned, depth).
+    Agents that are not attached pay nothing beyond filling that dict.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def attach(self, agent):
+        step = agent.step
+
+        def instrumented_step(env):
+            agent.search_stats = {}
+            t0 = time.perf_counter()
+            action, info = step(env)
+            elapsed = time.perf_counter() - t0
+
+            stats = agent.search_stats
+            self.records.append({
+                'agent': agent.id,
+                'agent_type': agent.agent_type,
+                'step': getattr(env, 'steps', None),
+                'action': action,
+                'info': None if info is None else int(info),
+                'time': elapsed,
+                'searched': bool(stats),
+                'expanded': stats.get('expanded', 0),
+                'generated': stats.get('generated', 0),
+                'max_open': stats.get('max_open'),
+                'closed': stats.get('closed', 0),
+                'tt_hits': stats.get('tt_hits', 0),
+                'pruned': stats.get('pruned', 0),
+                'depth': stats.get('depth'),
+                'ebf': effective_branching_factor(stats.get('generated', 0), stats.get('depth')),
+            })
+            return action, info
+
+        agent.step = instrumented_step
+        agent.instrumentation = self
+        return agent
+
+    def for_agent(self, agent_id):
+        return [r for r in self.records if r['agent'] == agent_id]
+
+    def summary(self):
+        """Totals per agent: decisions, searches, nodes expanded / generated, time."""
+        out = {}
+        for r in self.records:
+            s = out.setdefault(r['agent'], {'agent_type': r['agent_type'], 'decisions': 0, 'searches': 0,
+                                            'expanded': 0, 'generated': 0, 'time': 0.0})
+            s['decisions'] += 1
+            s['searches'] += r['searched']
+            s['expanded'] += r['expanded']
+            s['generated'] += r['generated']
+            s['time'] += r['time']
+        return out
+
+    def dump(self, path):
+        """Write the records as JSON lines."""
+        with open(path, 'w') as f:
+            for r in self.records:
+                f.write(json.dumps(r) + '\n')
@@ -0,0 +1,145 @@
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from Assignments_1_2.utils.greedy import ShortestPathEngine
+
+
+class LandmarkOracle:
+    """
+    ALT (A*, Landmarks, Triangle inequality) distance oracle for one undirected graph.
+
+    W: numpy array shape (n, n), W[i, j] = weight >= 0, or -1 if no edge.
+    One Dijkstra per landmark is run up front and only the landmark -> vertex
+    distances are kept, O(#landmarks) memory per vertex instead of the O(n^2)
+    all-pairs matrix. For any landmark L the triangle inequality gives
+
+        d(u, v) >= |d(L, u) - d(L, v)|
+
+    so lower_bound(u, v) (the best such bound) is admissible wherever the
+    optimistic all-pairs distance was used. oracle[u][v] reads like a row of
+    env.optimistic_dist, so the oracle can stand in for that matrix.
+
+    distance(u, v) answers exact point-to-point queries with bidirectional
+    Dijkstra; the last cache_size answers are kept (LRU).
+    """
+
+    def __init__(self, W, n_landmarks=8, cache_size=4096):
+        self.engine = ShortestPathEngine(W)
+        self.n = self.engine.n
+        self.landmarks = []
+        self.table = None           # table[i, v] = d(landmarks[i], v)
+        self._select_landmarks(min(n_landmarks, self.n))
+        self._columns = [self.table[:, v].tolist() for v in range(self.n)]
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    def _select_landmarks(self, k):
+        """
+        Farthest-point selection: every new landmark is the vertex farthest from
+        the ones already chosen (a vertex no landmark reaches counts as farthest,
+        so every connected component gets one). Ties: lowest index.
+        """
+        nearest = np.full(self.n, np.inf)
+        candidate = 0
+        rows = []
+        for _ in range(k):
+            dist, _parent = self.engine.tree(candidate)
+            self.landmarks.append(candidate)
+            rows.append(dist)
+            nearest = np.minimum(nearest, dist)
+            if np.all(nearest == 0):
+                break
+            candidate = int(np.argmax(nearest))   # inf (not covered yet) wins
+        self.table = np.array(rows)
+
+    # ---------------------------------------------------------
+    # Lower bounds
+    # ---------------------------------------------------------
+    def lower_bound(self, u, v):
+        """max over landmarks of |d(L, u) - d(L, v)|; inf if u and v lie in different components."""
+        if u == v:
+            return 0.0
+        best = 0.0
+        for du, dv in zip(self._columns[u], self._columns[v]):
+            if du == math.inf or dv == math.inf:
+                if du != dv:
+                    return math.inf   # the landmark reaches exactly one of them
+                continue
+            bound = du - dv if du > dv else dv - du
+            if bound > best:
+                best = bound
+        return best
+
+    def __getitem__(self, u):
+        return _OracleRow(self, u)
+
+    # ---------------------------------------------------------
+    # Exact queries
+    # ---------------------------------------------------------
+    def distance(self, u, v):
+        """Exact shortest-path distance (inf if unreachable), via bidirectional Dijkstra."""
+        key = (u, v) if u <= v else (v, u)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+
+        d = self._bidirectional(u, v)
+        self._cache[key] = d
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return d
+
+    def _bidirectional(self, source, target):
+        if source == target:
+            return 0.0
+        if self.lower_bound(source, target) == math.inf:
+            return math.inf
+
+        neighbors = self.engine.neighbors
+        dist = ({source: 0.0}, {target: 0.0})       # forward, backward
+        settled = (set(), set())
+        queues = ([(0.0, source)], [(0.0, target)])
+        best = math.inf
+
+        while queues[0] and queues[1]:
+            # stop once no path through an unsettled vertex can beat the best meeting point
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            d, u = heapq.heappop(queues[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+
+            mine, other = dist[side], dist[1 - side]
+            for x, w in neighbors[u]:
+                nd = d + w
+                if nd < mine.get(x, math.inf):
+                    mine[x] = nd
+                    heapq.heappush(queues[side], (nd, x))
+                if x in other and nd + other[x] < best:
+                    best = nd + other[x]
+        return float(best)
+
+    def stats(self):
+        return {'landmarks': len(self.landmarks), 'cached': len(self._cache), 'hits': self.hits,
+                'misses': self.misses}
+
+
+class _OracleRow:
+    """oracle[u]: indexable like a row of the all-pairs matrix, row[v] = lower_bound(u, v)."""
+    __slots__ = ('oracle', 'u')
+
+    def __init__(self, oracle, u):
+        self.oracle = oracle
+        self.u = u
+
+    def __getitem__(self, v):
+        return self.oracle.lower_bound(self.u, v)
@@ -0,0 +1,82 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+
+
+def graph_hash(env):
+    """
+    Digest of everything static a plan depends on: weights, flooded edges, action
+    durations, the kind of distance table the heuristic reads and whether the search prunes
+    (the kits are part of the key).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(env.weights.tobytes())
+    h.update(env.flooded_flag.tobytes())
+    h.update(repr(sorted(env.action_duration.items())).encode())
+    h.update(type(env.optimistic_dist).__name__.encode())
+    h.update(b'flood-aware' if getattr(env, 'flood_aware', False) else b'optimistic')
+    h.update(b'pruned' if getattr(env, 'prune', False) else b'full')
+    return h.hexdigest()
+
+
+class PlanCache:
+    """
+    LRU cache of search plans shared between agents (and, if passed to several
+    Environments, between episodes).
+
+    A plan is keyed by (graph hash, planner kind, start state), where the start
+    state is the compact search key (position, remaining_people, has_kit) plus
+    the kits lying on the map, since EQUIP depends on them. The searches are
+    deterministic, so a hit returns exactly the plan the search would produce;
+    failed searches (empty plans) are cached too.
+
+    At most maxsize plans are kept; the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self._graph_hashes = weakref.WeakKeyDictionary()   # env -> graph_hash(env)
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._plans)
+
+    def key(self, env, kind, state):
+        if env not in self._graph_hashes:
+            self._graph_hashes[env] = graph_hash(env)
+        kits = tuple(objs.count('K') for objs in env.objects)
+        return self._graph_hashes[env], kind, state.key(), kits
+
+    def get(self, key):
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self._plans.move_to_end(key)
+        self.hits += 1
+        return list(plan)
+
+    def put(self, key, plan):
+        self._plans[key] = tuple(plan)
+        self._plans.move_to_end(key)
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+            self.evictions += 1
+
+    def plan(self, env, kind, state, search):
+        """Cached plan from state, running search(state, env) on a miss."""
+        key = self.key(env, kind, state)
+        plan = self.get(key)
+        if plan is None:
+            plan = search(state, env)
+            self.put(key, plan)
+        return plan
+
+    def clear(self):
+        self._plans.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._plans), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits / lookups if lookups else 0.0}
@@ -29,7 +29,7 @@ def apply_rescue(remaining_list, vertex):
         new_rem[vertex] = 0      # all people at this vertex are now rescued
     return new_rem
 
-def successors(state, env):
+def successors(state, env, prune=False):
     """
     Generate all legal successor states from `state`,
     by performing all possible actions and collecting all the resulting states.
@@ -40,12 +40,18 @@ def successors(state, env):
               * TRAVERSE -> destination vertex index (int)
               * EQUIP / UNEQUIP / NO_OP -> None
     - step_cost: time added by executing that action (used as edge cost in search)
+
+    prune=True leaves out successors that can never be on a cheaper plan:
+    - NO_OP where nobody is waiting (same state, one step later)
+    - EQUIP right after UNEQUIP and UNEQUIP right after EQUIP (back to the grandparent state)
+    - UNEQUIP when moving with the kit is no slower (amphibian duration <= 1)
     """
     succs = []
 
     pos = state.position              # current vertex
     remaining = list(state.remaining_people)  # list[int], will copy per successor
     has_kit = state.has_kit
+    last_action = state.action_from_parent[0] if state.action_from_parent else None
 
     # 1. TRAVERSE to adjacent vertices (respect flooded edges + amphibian kit)
     for v in env.get_adjacent_vertices(pos):
@@ -73,7 +79,7 @@ def successors(state, env):
         succs.append((next_state, (Actions.TRAVERSE, v), step_cost))
 
     # 2. EQUIP (if there is a kit here and we don't already hold one)
-    if not has_kit and env.check_amphibian_availability(pos):
+    if not has_kit and env.check_amphibian_availability(pos) and not (prune and last_action == Actions.UNEQUIP):
         # After this step, if there are people here, they’ll also be rescued
         new_remaining = apply_rescue(remaining, pos)
         new_has_kit = True
@@ -89,7 +95,7 @@ def successors(state, env):
         succs.append((next_state, (Actions.EQUIP, None), step_cost))
 
     # 3. UNEQUIP (if we currently hold the kit)
-    if has_kit:
+    if has_kit and not (prune and (last_action == Actions.EQUIP or env.action_duration['amphibian'] <= 1)):
         new_remaining = apply_rescue(remaining, pos)
         new_has_kit = False
         step_cost = env.action_duration['unequip']
@@ -105,6 +111,8 @@ def successors(state, env):
 
     # 4. NO_OP (stay in place for one time unit)
     # In the real env, if you stand on a P* vertex, people are rescued anyway.
+    if prune and remaining[pos] == 0:
+        return succs
     new_remaining = apply_rescue(remaining, pos)
     step_cost = 1
 
@@ -118,3 +126,21 @@ def successors(state, env):
     succs.append((next_state, (Actions.NO_OP, None), step_cost))
 
     return succs
+
+
+def dominated(state, g, best_g, env):
+    """
+    True if the same vertex and remaining people were already reached with the other kit
+    status, so cheaply that switching to ours would still cost less than g:
+    - with the kit, at cost g' < g - unequip (UNEQUIP gets us here)
+    - without it, at cost g' < g - equip, where a kit lies (EQUIP gets us here)
+    Strict, so the switch itself (cost exactly g' + unequip / equip) is never pruned.
+    best_g maps state keys to the cheapest cost found so far.
+    """
+    twin = (state.position, state.remaining_people, not state.has_kit)
+    if twin not in best_g:
+        return False
+    if state.has_kit:
+        return (env.check_amphibian_availability(state.position)
+                and best_g[twin] + env.action_duration['equip'] < g)
+    return best_g[twin] + env.action_duration['unequip'] < g
@@ -0,0 +1,325 @@
+## Micro-benchmarks for the hot paths of every assignment
+#
+#   python benchmarks/bench.py                         run everything, write results/<commit>.json
+#   python benchmarks/bench.py --filter dijkstra       only benchmarks whose name contains "dijkstra"
+#   python benchmarks/bench.py --compare results/abc1234.json
+#                                                      run, then compare against an older run
+#   python benchmarks/bench.py --current new.json --compare old.json
+#                                                      compare two saved runs without running
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The projects import their siblings by bare module name (and Assignments_1_2 also
+# through the repo root), so each project directory goes on the path.
+for path in (ROOT, os.path.join(ROOT, "Assignments_1_2"),
+             os.path.join(ROOT, "Assignment3"), os.path.join(ROOT, "Assignment4")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import numpy as np
+import yaml
+
+from scenarios import grid_graph
+
+
+# ---------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------
+def weight_matrix(n, edges):
+    W = -1 * np.ones((n, n)).astype(int)
+    for u, v, w in edges:
+        W[u][v] = W[v][u] = w
+    return W
+
+
+def make_environment(rows, cols, agents, n_people=3, flood_rate=0.2, seed=0,
+                     action_duration=None):
+    """Assignments_1_2 Environment on a grid, built through a temporary YAML config."""
+    from environments.environment import Environment
+
+    rng = random.Random(seed)
+    n, edges = grid_graph(rows, cols, seed)
+    people = rng.sample(range(1, n), min(n_people, n - 1))
+    config = {
+        "vertices": {"N": n, "objects": ["0,K"] + [f"{v},P{rng.randint(1, 3)}" for v in people]},
+        "edges": [f"{u},{v},{w}" + (",F" if rng.random() < flood_rate else "") for u, v, w in edges],
+        "action_duration": action_duration or {"unequip": 1, "equip": 2, "amphibian": 3},
+        "agents": [f"{kind},{pos}" for kind, pos in agents],
+    }
+    fd, path = tempfile.mkstemp(suffix=".yaml")
+    try:
+        with os.fdopen(fd, "w") as f:
+            yaml.safe_dump(config, f)
+        return Environment(yaml_path=path)
+    finally:
+        os.remove(path)
+
+
+def search_start_state(env, position=0):
+    from utils.search import SearchState
+
+    remaining = [0] * env.n_vertices
+    for v, objs in enumerate(env.objects):
+        for obj in objs:
+            if obj.startswith('P'):
+                remaining[v] += int(obj[1:])
+    return SearchState(position, tuple(remaining), False)
+
+
+def hurricane_network(rows, cols, seed=0):
+    from hurricane_bn import build_bn
+
+    rng = random.Random(seed)
+    n, edges = grid_graph(rows, cols, seed)
+    edge_dicts = [{"from": u, "to": v, "weight": w, "p_mild": round(rng.uniform(0.05, 0.3), 2),
+                   "flooded_observed": None} for u, v, w in edges]
+    bn = build_bn(n, edge_dicts, 0.3, {"mild": 0.5, "stormy": 0.3, "extreme": 0.2})
+    return n, bn
+
+
+def belief_mdp(rows, cols, n_uncertain, seed=0):
+    from belief_mdp import BeliefMDP
+
+    rng = random.Random(seed)
+    n, edges = grid_graph(rows, cols, seed)
+    uncertain = set(rng.sample(range(len(edges)), n_uncertain))
+    mdp_edges = [(u, v, float(w), round(rng.uniform(0.1, 0.6), 2) if i in uncertain else 0.0)
+                 for i, (u, v, w) in enumerate(edges)]
+    return BeliefMDP(n, mdp_edges, 0, n - 1)
+
+
+# ---------------------------------------------------------
+# Benchmarks: setup(size) -> zero-argument callable to time
+# ---------------------------------------------------------
+def bench_precompute_distances(size):
+    from Assignments_1_2.utils.heuristic import precompute_distances
+    W = weight_matrix(*grid_graph(size, size))
+    return lambda: precompute_distances(W)
+
+
+def bench_dijkstra(size):
+    from Assignments_1_2.utils.greedy import dijkstra
+    n, edges = grid_graph(size, size)
+    W = weight_matrix(n, edges)
+    return lambda: dijkstra(0, W, [n - 1])
+
+
+def bench_path_engine(size):
+    from Assignments_1_2.utils.greedy import ShortestPathEngine
+    n, edges = grid_graph(size, size)
+    engine = ShortestPathEngine(weight_matrix(n, edges))
+    targets = list(range(n - size, n))  # the far row, as a changing target set would be
+
+    def query():
+        engine._cache.clear()  # time the search, not the cache
+        return engine.nearest(0, targets)
+    return query
+
+
+def bench_landmark_distance(size):
+    from Assignments_1_2.utils.landmarks import LandmarkOracle
+    n, edges = grid_graph(size, size)
+    oracle = LandmarkOracle(weight_matrix(n, edges), cache_size=0)
+    return lambda: oracle.distance(0, n - 1)
+
+
+def bench_contraction_distance(size):
+    from Assignments_1_2.utils.contraction import ContractionHierarchy
+    n, edges = grid_graph(size, size)
+    hierarchy = ContractionHierarchy.build(weight_matrix(n, edges), cache_size=0)
+    return lambda: hierarchy.distance(0, n - 1)
+
+
+def bench_successors(size):
+    from utils.search import successors
+    env = make_environment(size, size, [("a-star", 0)], n_people=size)
+    state = search_start_state(env, position=env.n_vertices // 2)
+    return lambda: successors(state, env)
+
+
+def bench_successors_game(size):
+    from utils.minimax_rules import successors_game
+    env = make_environment(size, size, [("minimax", 0), ("minimax", size * size - 1)],
+                           n_people=size)
+    state = env.agents[0]._build_state_from_env(env)
+    return lambda: successors_game(state, env)
+
+
+def bench_a_star_search(size):
+    env = make_environment(size, size, [("a-star", 0)], n_people=4)
+    agent = env.agents[0]
+    state = search_start_state(env)
+    return lambda: agent.a_star_search(state, env)
+
+
+def bench_macro_search(size):
+    env = make_environment(size, size, [("macro-a-star", 0)], n_people=4)
+    agent = env.agents[0]
+    state = search_start_state(env)
+    return lambda: agent.macro_search(state, env)
+
+
+def bench_minimax_step(size):
+    env = make_environment(size, size, [("minimax", 0), ("minimax", size * size - 1)],
+                           n_people=3, action_duration={"unequip": 1, "equip": 1, "amphibian": 1})
+    agent = env.agents[0]
+    return lambda: agent.step(env)
+
+
+def bench_inference_query(size):
+    from inference import query
+    rows, cols = size
+    n, bn = hurricane_network(rows, cols)
+    # every evacuee node observed (present only at vertex 0): enumeration sums over W and F_i
+    evidence = {f"Ev{v}": v == 0 for v in range(n)}
+    return lambda: query(bn, "W", evidence)
+
+
+def bench_reachable_beliefs(size):
+    mdp = belief_mdp(4, 4, size)
+    return mdp.reachable_beliefs
+
+
+def bench_value_iteration(size):
+    from value_iteration import value_iteration
+    mdp = belief_mdp(4, 4, size)
+    return lambda: value_iteration(mdp)
+
+
+# name -> (setup, sizes); sizes are grid sides unless noted
+BENCHMARKS = {
+    "precompute_distances": (bench_precompute_distances, [5, 7, 10]),
+    "greedy.dijkstra": (bench_dijkstra, [10, 20, 30]),
+    "greedy.ShortestPathEngine.nearest": (bench_path_engine, [10, 20, 30]),
+    "LandmarkOracle.distance": (bench_landmark_distance, [10, 20, 30]),
+    "ContractionHierarchy.distance": (bench_contraction_distance, [10, 20, 30]),
+    "search.successors": (bench_successors, [5, 10, 20]),
+    "minimax_rules.successors_game": (bench_successors_game, [5, 10, 20]),
+    "AStarSearch.a_star_search": (bench_a_star_search, [4, 6, 8]),
+    "MacroAStarSearch.macro_search": (bench_macro_search, [4, 6, 8]),
+    "MinimaxAgent.step": (bench_minimax_step, [3, 4]),
+    "inference.query": (bench_inference_query, [(2, 2), (2, 3), (3, 3)]),      # grid rows x cols
+    "BeliefMDP.reachable_beliefs": (bench_reachable_beliefs, [4, 6, 8]),    # uncertain edges
+    "value_iteration": (bench_value_iteration, [4, 6]),                     # uncertain edges
+}
+
+
+# ---------------------------------------------------------
+# Timing / results
+# ---------------------------------------------------------
+def measure(fn, repeats=5, min_time=0.05):
+    """Per-call seconds over `repeats` rounds, each long enough to time reliably."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    samples.sort()
+    return {
+        "min": samples[0],
+        "median": samples[len(samples) // 2],
+        "mean": sum(samples) / len(samples),
+        "repeats": repeats,
+        "number": number,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(name_filter=None, repeats=5, min_time=0.05):
+    results = []
+    for name, (setup, sizes) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in sizes:
+            fn = setup(size)
+            timing = measure(fn, repeats, min_time)
+            results.append({"name": name, "size": str(size), **timing})
+            print(f"{name:32} {str(size):8} {timing['median'] * 1e3:12.4f} ms")
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """Print median ratios current / baseline; returns the number of regressions."""
+    old = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n{baseline['commit']} -> {current['commit']}")
+    for r in current["results"]:
+        key = (r["name"], r["size"])
+        if key not in old:
+            continue
+        ratio = r["median"] / old[key]["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{r['name']:32} {r['size']:8} {ratio:8.3f}x{flag}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    arg_parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed round")
+    arg_parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    arg_parser.add_argument("--current", help="compare this saved run instead of running")
+    arg_parser.add_argument("--compare", metavar="BASELINE", help="saved run to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="relative slowdown reported as a regression")
+    args = arg_parser.parse_args()
+
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run(args.filter, args.repeats, args.min_time)
+        output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{current['commit']}.json")
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
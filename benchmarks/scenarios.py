@@ -0,0 +1,273 @@
+## Seeded synthetic scenarios in every project's YAML format
+#
+#   python benchmarks/scenarios.py --kind grid --sizes 25 100 400 --out-dir scenarios
+#   python benchmarks/scenarios.py --project 4 --kind geometric --sizes 50 --count 10 --uncertain 8
+#
+# Writes <out-dir>/<project>_<kind>_n<N>_s<seed>.yaml, loadable by
+# Assignments_1_2 (Environment), Assignment3 (parse_yaml) and Assignment4 (parse_config).
+import argparse
+import math
+import os
+import random
+from collections import deque
+
+import yaml
+
+KINDS = ("grid", "geometric", "scale-free")
+PROJECTS = ("12", "3", "4")
+
+
+# ---------------------------------------------------------
+# Graph families: (n, [(u, v, w), ...]), always connected
+# ---------------------------------------------------------
+def grid_graph(rows, cols, seed=0, max_weight=5):
+    """rows x cols grid with random integer weights."""
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c
+            if c + 1 < cols:
+                edges.append((v, v + 1, rng.randint(1, max_weight)))
+            if r + 1 < rows:
+                edges.append((v, v + cols, rng.randint(1, max_weight)))
+    return rows * cols, edges
+
+
+def geometric_graph(n, seed=0, max_weight=5, degree=4):
+    """
+    Random geometric graph: n points in the unit square, joined when closer than the
+    radius giving about `degree` neighbours on average; weights grow with distance.
+    Components are then chained by their closest pair of points, like bridges.
+    """
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    radius = math.sqrt(degree / (math.pi * n))
+
+    def weight(u, v):
+        d = math.dist(points[u], points[v])
+        return max(1, min(max_weight, math.ceil(max_weight * d / radius)))
+
+    edges = [(u, v, weight(u, v)) for u in range(n) for v in range(u + 1, n)
+             if math.dist(points[u], points[v]) <= radius]
+
+    components = _components(n, edges)
+    for comp, nxt in zip(components, components[1:]):
+        u, v = min(((a, b) for a in comp for b in nxt), key=lambda ab: math.dist(points[ab[0]], points[ab[1]]))
+        edges.append((min(u, v), max(u, v), weight(u, v)))
+    return n, edges
+
+
+def scale_free_graph(n, seed=0, max_weight=5, m=2):
+    """Barabasi-Albert preferential attachment: each new vertex links to m existing ones."""
+    rng = random.Random(seed)
+    m = max(1, min(m, n - 1))
+    edges = [(u, v, rng.randint(1, max_weight)) for u in range(m + 1) for v in range(u + 1, m + 1)]
+    # every vertex appears once per incident edge, so sampling is degree-proportional
+    ends = [x for u, v, _w in edges for x in (u, v)]
+    for v in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(ends))
+        for u in sorted(targets):
+            edges.append((u, v, rng.randint(1, max_weight)))
+            ends.extend((u, v))
+    return n, edges
+
+
+def make_graph(kind, n, seed=0, max_weight=5):
+    if kind == "grid":
+        rows = max(1, int(math.sqrt(n)))
+        return grid_graph(rows, math.ceil(n / rows), seed, max_weight)
+    if kind == "geometric":
+        return geometric_graph(n, seed, max_weight)
+    if kind == "scale-free":
+        return scale_free_graph(n, seed, max_weight)
+    raise ValueError(f"Unknown graph kind: {kind}")
+
+
+def _components(n, edges):
+    adj = [[] for _ in range(n)]
+    for u, v, _w in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    seen = [False] * n
+    components = []
+    for s in range(n):
+        if seen[s]:
+            continue
+        seen[s] = True
+        comp, queue = [], deque([s])
+        while queue:
+            x = queue.popleft()
+            comp.append(x)
+            for y in adj[x]:
+                if not seen[y]:
+                    seen[y] = True
+                    queue.append(y)
+        components.append(comp)
+    return components
+
+
+def _farthest(n, edges, start):
+    """Vertex with the most hops from start (ties: lowest index)."""
+    hops = [math.inf] * n
+    hops[start] = 0
+    adj = [[] for _ in range(n)]
+    for u, v, _w in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    queue = deque([start])
+    while queue:
+        x = queue.popleft()
+        for y in adj[x]:
+            if hops[y] == math.inf:
+                hops[y] = hops[x] + 1
+                queue.append(y)
+    return max(range(n), key=lambda v: (hops[v] if hops[v] < math.inf else -1, -v))
+
+
+# ---------------------------------------------------------
+# Project formats
+# ---------------------------------------------------------
+def assignment12_config(graph, seed=0, flood_rate=0.2, people_density=0.1, kit_density=0.05,
+                        agents=("a-star,0",), action_duration=None):
+    """Assignments_1_2 environment: flooded edges marked 'F', people 'P<k>' and kits 'K'."""
+    rng = random.Random(seed)
+    n, edges = graph
+    objects = [[] for _ in range(n)]
+    objects[0].append("K")  # at least one kit, at the usual start vertex
+    for v in range(n):
+        if v > 0 and rng.random() < kit_density:
+            objects[v].append("K")
+        if v > 0 and rng.random() < people_density:
+            objects[v].append(f"P{rng.randint(1, 3)}")
+    if not any(obj.startswith("P") for objs in objects for obj in objs):
+        objects[rng.randrange(1, n) if n > 1 else 0].append("P1")
+
+    return {
+        "vertices": {"N": n, "objects": [",".join([str(v)] + objs) for v, objs in enumerate(objects) if objs]},
+        "edges": [f"{u},{v},{w}" + (",F" if rng.random() < flood_rate else "") for u, v, w in edges],
+        "action_duration": action_duration or {"unequip": 1, "equip": 2, "amphibian": 3},
+        "agents": list(agents),
+    }
+
+
+def assignment3_config(graph, seed=0, uncertain=None, flood_rate=0.0, people_density=0.1,
+                       P1=0.3, weather_prior=None, max_p=0.3):
+    """Assignment3 network: 'A,B,W,F?,p', p = P(flooded | mild) > 0 on `uncertain` edges."""
+    rng = random.Random(seed)
+    n, edges = graph
+    chosen = _choose_uncertain(rng, len(edges), uncertain)
+    lines = []
+    for i, (u, v, w) in enumerate(edges):
+        flooded = "F" if rng.random() < flood_rate else ""
+        p = round(rng.uniform(0.05, max_p), 2) if i in chosen else 0
+        lines.append(f"{u},{v},{w},{flooded},{p}")
+
+    people = [f"{v},P{rng.randint(1, 3)}" for v in range(n) if rng.random() < people_density]
+    return {
+        "vertices": {"N": n, "objects": ["0,K"] + people},
+        "edges": lines,
+        "uncertainty": {
+            "P1": P1,
+            "weather_prior": weather_prior or {"mild": 0.5, "stormy": 0.3, "extreme": 0.2},
+        },
+    }
+
+
+def assignment4_config(graph, seed=0, uncertain=None, start=0, target=None, max_p=0.6,
+                       weather_prior=None):
+    """Assignment4 belief MDP: 'u,v,w,p' with p > 0 on `uncertain` edges; target defaults to the farthest vertex."""
+    rng = random.Random(seed)
+    n, edges = graph
+    chosen = _choose_uncertain(rng, len(edges), uncertain)
+    config = {
+        "vertices": {"N": n},
+        "start": start,
+        "target": _farthest(n, edges, start) if target is None else target,
+        "edges": [f"{u},{v},{w},{round(rng.uniform(0.1, max_p), 2) if i in chosen else 0.0}"
+                  for i, (u, v, w) in enumerate(edges)],
+    }
+    if weather_prior:
+        config["uncertainty"] = {"weather_prior": weather_prior}
+    return config
+
+
+def _choose_uncertain(rng, n_edges, uncertain):
+    if uncertain is None:
+        uncertain = max(1, n_edges // 10)
+    return set(rng.sample(range(n_edges), min(uncertain, n_edges)))
+
+
+def write_yaml(config, path):
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+
+
+def generate(out_dir, projects=PROJECTS, kinds=KINDS, sizes=(25,), count=1, seed=0, **options):
+    """Write count scenarios per (project, kind, size); returns the written paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    writers = {"12": _write_12, "3": _write_3, "4": _write_4}
+    paths = []
+    for kind in kinds:
+        for n in sizes:
+            for i in range(count):
+                s = seed + i
+                graph = make_graph(kind, n, s, options.get("max_weight", 5))
+                for project in projects:
+                    path = os.path.join(out_dir, f"{project}_{kind}_n{graph[0]}_s{s}.yaml")
+                    write_yaml(writers[project](graph, s, options), path)
+                    paths.append(path)
+    return paths
+
+
+def _write_12(graph, seed, options):
+    return assignment12_config(graph, seed, options.get("flood_rate", 0.2), options.get("people_density", 0.1),
+                               options.get("kit_density", 0.05), options.get("agents", ("a-star,0",)))
+
+
+def _write_3(graph, seed, options):
+    return assignment3_config(graph, seed, options.get("uncertain"), people_density=options.get("people_density", 0.1))
+
+
+def _write_4(graph, seed, options):
+    return assignment4_config(graph, seed, options.get("uncertain"))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--out-dir", default="scenarios")
+    arg_parser.add_argument("--project", choices=PROJECTS + ("all",), default="all")
+    arg_parser.add_argument("--kind", choices=KINDS + ("all",), default="all")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100])
+    arg_parser.add_argument("--count", type=int, default=1, help="scenarios per project, kind and size")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--max-weight", type=int, default=5)
+    arg_parser.add_argument("--flood-rate", type=float, default=0.2, help="fraction of flooded edges (1-2)")
+    arg_parser.add_argument("--people-density", type=float, default=0.1, help="fraction of vertices with people")
+    arg_parser.add_argument("--kit-density", type=float, default=0.05, help="fraction of vertices with a kit (1-2)")
+    arg_parser.add_argument("--uncertain", type=int, default=None,
+                            help="uncertain edges (3, 4); default: a tenth of the edges")
+    arg_parser.add_argument("--agents", nargs="+", default=["a-star,0"], help="'type,position' entries (1-2)")
+    args = arg_parser.parse_args()
+
+    paths = generate(
+        args.out_dir,
+        projects=PROJECTS if args.project == "all" else (args.project,),
+        kinds=KINDS if args.kind == "all" else (args.kind,),
+        sizes=args.sizes,
+        count=args.count,
+        seed=args.seed,
+        max_weight=args.max_weight,
+        flood_rate=args.flood_rate,
+        people_density=args.people_density,
+        kit_density=args.kit_density,
+        uncertain=args.uncertain,
+        agents=args.agents,
+    )
+    print(f"Wrote {len(paths)} scenarios to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()